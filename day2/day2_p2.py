@@ -1,15 +1,8 @@
-from day2.intcode_d2 import Intcode
-from sys import exit
+from day2.symbolic import solve
 
 with open('input_day2.txt', 'r') as infile:
     program_init = [int(v) for v in infile.read().split(',')]
-for noun in range(100):
-    for verb in range(100):
-        program = program_init.copy()
-        program[1] = noun
-        program[2] = verb
-        intcode = Intcode(program)
-        intcode.run()
-        if intcode.mem[0] == 19690720:
-            print(f'Found. Noun={noun}, verb={verb}, answer={(100*noun) + verb}')
-            exit()
+# Solves mem[0] = target for noun/verb from one symbolic run of the program.
+# day2.search.search() finds the same answer by brute force.
+noun, verb = solve(program_init, 19690720, nouns=range(100), verbs=range(100))
+print(f'Found. Noun={noun}, verb={verb}, answer={(100*noun) + verb}')
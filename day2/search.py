@@ -0,0 +1,123 @@
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import Value
+from os import cpu_count
+from time import perf_counter
+
+from day2.intcode_d2 import Intcode
+
+SearchResult = namedtuple('SearchResult', ['noun', 'verb', 'programs_run', 'seconds'])
+
+# Lowest chunk index with a known match, shared with worker processes so they can stop early
+_stop_chunk = None
+
+
+def run_program(program, noun, verb):
+    """Run program with noun and verb in mem[1] and mem[2]. Return mem[0]."""
+    memory = program.copy()
+    memory[1] = noun
+    memory[2] = verb
+    intcode = Intcode(memory)
+    intcode.run()
+    return intcode.mem[0]
+
+
+def search(program, target, nouns=range(100), verbs=range(100), processes=None, chunk_size=None):
+    """Find the first (noun, verb), in noun-major order, for which program leaves target in mem[0].
+
+    The nouns are split into chunks of chunk_size which are searched across [processes] worker
+    processes. Once a chunk finds a match, chunks after it are cancelled or stop early.
+    Returns a SearchResult; noun and verb are None if there is no match.
+    """
+    nouns = list(nouns)
+    verbs = list(verbs)
+    if processes is None:
+        processes = cpu_count()
+    if chunk_size is None:
+        # A few chunks per process, so a match stops the search soon after it's found
+        chunk_size = max(1, len(nouns) // (processes * 4))
+    chunks = [nouns[i:i+chunk_size] for i in range(0, len(nouns), chunk_size)]
+
+    start = perf_counter()
+    if processes == 1:
+        _init_worker(Value('i', len(chunks)))
+        programs_run = 0
+        match = None
+        for i, chunk in enumerate(chunks):
+            found, count = _search_chunk(i, program, target, chunk, verbs)
+            programs_run += count
+            if found is not None:
+                match = found
+                break
+    else:
+        match, programs_run = _search_parallel(program, target, chunks, verbs, processes)
+    elapsed = perf_counter() - start
+
+    noun, verb = match if match is not None else (None, None)
+    return SearchResult(noun, verb, programs_run, elapsed)
+
+
+def _search_parallel(program, target, chunks, verbs, processes):
+    """Search chunks across a process pool. Returns (first (noun, verb) match or None, programs run)."""
+    stop_chunk = Value('i', len(chunks))
+    matches = {}
+    programs_run = 0
+    with ProcessPoolExecutor(processes, initializer=_init_worker, initargs=(stop_chunk,)) as executor:
+        futures = {executor.submit(_search_chunk, i, program, target, chunk, verbs): i
+                   for i, chunk in enumerate(chunks)}
+        for future in as_completed(futures):
+            if future.cancelled():
+                continue
+            found, count = future.result()
+            programs_run += count
+            if found is None:
+                continue
+            i = futures[future]
+            matches[i] = found
+            with stop_chunk.get_lock():
+                stop_chunk.value = min(stop_chunk.value, i)
+            # Later chunks can't hold the first match. Cancel the queued ones;
+            # running ones see stop_chunk and return early.
+            for other, j in futures.items():
+                if j > i:
+                    other.cancel()
+
+    if not matches:
+        return None, programs_run
+    return matches[min(matches)], programs_run
+
+
+def _init_worker(stop_chunk):
+    global _stop_chunk
+    _stop_chunk = stop_chunk
+
+
+def _search_chunk(chunk_index, program, target, nouns, verbs):
+    """Search one chunk of nouns. Returns (first (noun, verb) match or None, programs run)."""
+    count = 0
+    for noun in nouns:
+        # An earlier chunk already has a match, so nothing here can be first
+        if _stop_chunk.value < chunk_index:
+            break
+        for verb in verbs:
+            count += 1
+            if run_program(program, noun, verb) == target:
+                return (noun, verb), count
+    return None, count
+
+
+if __name__ == "__main__":
+    with open('input_day2.txt', 'r') as infile:
+        program = [int(v) for v in infile.read().split(',')]
+
+    result = search(program, 19690720)
+    print(f'Noun={result.noun}, verb={result.verb}, answer={(100*result.noun) + result.verb}')
+    print(f'{result.programs_run} programs in {result.seconds:.3f}s')
+
+    # Throughput over a synthetic range with no match. The program reads mem[noun] and
+    # mem[verb], so pad memory out to cover the range.
+    size = 300
+    padded = program + [0]*(size - len(program))
+    for processes in sorted({1, 2, 4, cpu_count()}):
+        result = search(padded, -1, range(size), range(size), processes=processes)
+        print(f'{processes:>3} processes: {result.programs_run / result.seconds:,.0f} programs/s')
@@ -0,0 +1,218 @@
+from collections import namedtuple
+
+from day2.search import run_program
+
+# Expression DAG nodes. Memory cells hold nodes, so a value that is read more than once is
+# shared rather than copied.
+Const = namedtuple('Const', ['value'])
+Var = namedtuple('Var', ['name'])
+Add = namedtuple('Add', ['left', 'right'])
+Mul = namedtuple('Mul', ['left', 'right'])
+# Read of a symbolic address. memory is the (node) contents of memory at the time of the read.
+Load = namedtuple('Load', ['address', 'memory'])
+
+
+def add(left, right):
+    """Return a node for left + right, folding constants."""
+    if type(left) is Const and type(right) is Const:
+        return Const(left.value + right.value)
+    if left == Const(0):
+        return right
+    if right == Const(0):
+        return left
+    return Add(left, right)
+
+
+def mul(left, right):
+    """Return a node for left * right, folding constants."""
+    if type(left) is Const and type(right) is Const:
+        return Const(left.value * right.value)
+    if left == Const(0) or right == Const(0):
+        return Const(0)
+    if left == Const(1):
+        return right
+    if right == Const(1):
+        return left
+    return Mul(left, right)
+
+
+def symbolic_run(program, symbols=None):
+    """Run a day2 program (opcodes 1, 2, 99) once with some memory cells held symbolic.
+
+    symbols maps addresses to variable names, by default {1: 'noun', 2: 'verb'}.
+    Returns the final memory as a list of expression nodes. Raises ValueError if an opcode or
+    write address depends on a symbol.
+    """
+    if symbols is None:
+        symbols = {1: 'noun', 2: 'verb'}
+    mem = [Const(v) for v in program]
+    for address, name in symbols.items():
+        mem[address] = Var(name)
+
+    pointer = 0
+    while True:
+        opcode = _load(mem, pointer)
+        if type(opcode) is not Const:
+            raise ValueError(f'Opcode at {pointer} depends on {opcode}')
+        if opcode.value == 99:
+            return mem
+        if opcode.value not in (1, 2):
+            raise ValueError(f'Unknown opcode {opcode.value} at {pointer}')
+
+        p1 = _read(mem, _load(mem, pointer+1))
+        p2 = _read(mem, _load(mem, pointer+2))
+        res = _load(mem, pointer+3)
+        if type(res) is not Const:
+            raise ValueError(f'Write address at {pointer} depends on {res}')
+        if res.value < 0:
+            raise IndexError('Memory locations < 0 are not valid')
+        if res.value >= len(mem):
+            mem.extend([Const(0)] * (res.value + 1 - len(mem)))
+        mem[res.value] = add(p1, p2) if opcode.value == 1 else mul(p1, p2)
+        pointer += 4
+
+
+def _load(mem, address):
+    """Return the node at the integer address. Like the VM's memory, cells past the end read as 0."""
+    if address < 0:
+        raise IndexError('Memory locations < 0 are not valid')
+    return mem[address] if address < len(mem) else Const(0)
+
+
+def _read(mem, address):
+    """Return the node at address, which may itself be symbolic."""
+    if type(address) is Const:
+        return _load(mem, address.value)
+    return Load(address, tuple(mem))
+
+
+def evaluate(expr, env, _memo=None):
+    """Return the integer value of expr given variable values in env."""
+    if _memo is None:
+        _memo = {}
+    key = id(expr)
+    if key in _memo:
+        return _memo[key]
+
+    kind = type(expr)
+    if kind is Const:
+        val = expr.value
+    elif kind is Var:
+        val = env[expr.name]
+    elif kind is Add:
+        val = evaluate(expr.left, env, _memo) + evaluate(expr.right, env, _memo)
+    elif kind is Mul:
+        val = evaluate(expr.left, env, _memo) * evaluate(expr.right, env, _memo)
+    else:   # Load
+        address = evaluate(expr.address, env, _memo)
+        if address < 0:
+            raise IndexError(f'Memory location {address} is not valid')
+        val = evaluate(expr.memory[address], env, _memo) if address < len(expr.memory) else 0
+    _memo[key] = val
+    return val
+
+
+def to_poly(expr, names, _memo=None):
+    """Return expr as a polynomial {(exponent of each of names): coefficient}.
+
+    Raises ValueError if expr reads memory at a symbolic address.
+    """
+    if _memo is None:
+        _memo = {}
+    key = id(expr)
+    if key in _memo:
+        return _memo[key]
+
+    kind = type(expr)
+    if kind is Const:
+        poly = {(0,)*len(names): expr.value}
+    elif kind is Var:
+        poly = {tuple(int(n == expr.name) for n in names): 1}
+    elif kind is Add:
+        poly = dict(to_poly(expr.left, names, _memo))
+        for mono, coeff in to_poly(expr.right, names, _memo).items():
+            poly[mono] = poly.get(mono, 0) + coeff
+    elif kind is Mul:
+        poly = {}
+        for mono1, coeff1 in to_poly(expr.left, names, _memo).items():
+            for mono2, coeff2 in to_poly(expr.right, names, _memo).items():
+                mono = tuple(e1 + e2 for e1, e2 in zip(mono1, mono2))
+                poly[mono] = poly.get(mono, 0) + coeff1 * coeff2
+    else:
+        raise ValueError(f'Expression reads a symbolic address: {expr.address}')
+    poly = {mono: coeff for mono, coeff in poly.items() if coeff}
+    _memo[key] = poly
+    return poly
+
+
+def poly_str(poly, names):
+    """Return a readable string for a polynomial from to_poly."""
+    terms = []
+    for mono, coeff in sorted(poly.items(), reverse=True):
+        factors = [name if e == 1 else f'{name}^{e}' for name, e in zip(names, mono) if e]
+        if not factors:
+            terms.append(str(coeff))
+        elif coeff == 1:
+            terms.append('*'.join(factors))
+        else:
+            terms.append('*'.join([str(coeff)] + factors))
+    return ' + '.join(terms) if terms else '0'
+
+
+def solve(program, target, nouns=range(100), verbs=range(100)):
+    """Return the first (noun, verb), in noun-major order, that leaves target in mem[0], or None.
+
+    The program is run once symbolically. If mem[0] comes out as a polynomial that is at most
+    linear in verb, each noun is solved for verb directly. Otherwise (or if mem[0] depends on
+    a symbolic address) each pair is checked by evaluating the expression, still without
+    re-running the program. If an opcode or write address depends on noun or verb, there's no
+    single expression for mem[0], so the program is run for each pair instead.
+    """
+    try:
+        expr = symbolic_run(program)[0]
+    except ValueError:
+        for noun in nouns:
+            for verb in verbs:
+                if run_program(program, noun, verb) == target:
+                    return noun, verb
+        return None
+    verb_set = set(verbs)
+    try:
+        poly = to_poly(expr, ('noun', 'verb'))
+    except ValueError:
+        poly = None
+
+    for noun in nouns:
+        if poly is not None:
+            # Collect the coefficients of verb^k at this noun
+            coeffs = {}
+            for (noun_exp, verb_exp), coeff in poly.items():
+                coeffs[verb_exp] = coeffs.get(verb_exp, 0) + coeff * noun**noun_exp
+            if max(coeffs, default=0) <= 1:
+                c0 = coeffs.get(0, 0)
+                c1 = coeffs.get(1, 0)
+                if c1 == 0:
+                    if c0 == target and verb_set:
+                        return noun, next(iter(verbs))
+                elif (target - c0) % c1 == 0 and (target - c0) // c1 in verb_set:
+                    return noun, (target - c0) // c1
+                continue
+
+        for verb in verbs:
+            try:
+                if evaluate(expr, {'noun': noun, 'verb': verb}) == target:
+                    return noun, verb
+            except IndexError:
+                # The real program would fail to run for this pair
+                continue
+    return None
+
+
+if __name__ == "__main__":
+    with open('input_day2.txt', 'r') as infile:
+        program = [int(v) for v in infile.read().split(',')]
+
+    print(f'mem[0] = {poly_str(to_poly(symbolic_run(program)[0], ("noun", "verb")), ("noun", "verb"))}')
+    print(f'Part 1: {evaluate(symbolic_run(program)[0], {"noun": 12, "verb": 2})}')
+    noun, verb = solve(program, 19690720)
+    print(f'Part 2: Noun={noun}, verb={verb}, answer={(100*noun) + verb}')
@@ -0,0 +1,88 @@
+import tracemalloc
+from collections import Counter
+
+from day9.intcode_d9 import Intcode
+
+
+class SlicingIntcode(Intcode):
+    """Intcode that fetches parameters through a memory slice into a new list, as before operands were read by index."""
+    def _fetch_params_by_mode(self, num_args, modes, writes):
+        params = self.mem[self.pointer+1:self.pointer+1+num_args]
+        vals = []
+        for param, mode in list(zip(params, modes))[:-1 if writes else None]:
+            if mode == 0:
+                vals.append(self.mem[param])
+            elif mode == 1:
+                vals.append(param)
+            else:
+                vals.append(self.mem[param + self.relative_base])
+        if writes:
+            vals.append(params[-1] if modes[-1] == 0 else params[-1] + self.relative_base)
+        return vals
+
+
+def transient_bytes_per_step(vm_class, code, inputs, steps):
+    """Run [steps] instructions and return the mean peak bytes allocated while executing one."""
+    intcode = vm_class(code, inputs=inputs)
+    # Warm up the decode cache so only the steady state is measured
+    for _ in range(1000):
+        intcode._fetch_op()
+
+    total = 0
+    tracemalloc.start()
+    for _ in range(steps):
+        before = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        intcode._fetch_op()
+        total += tracemalloc.get_traced_memory()[1] - before
+    tracemalloc.stop()
+    return total / steps
+
+
+def blocks_per_step(vm_class, code, inputs, steps):
+    """Run [steps] instructions and return the mean number of memory blocks a step has allocated and still holds
+    once its parameters are fetched, and those counts by source line.
+
+    These come from tracemalloc snapshots taken just before the step and just after its parameters are fetched,
+    so they count what the operation is handed (the parameter list and the values in it), but not temporaries
+    that were already freed. transient_bytes_per_step() covers those.
+    """
+    counts = Counter()
+    filters = [tracemalloc.Filter(True, '*/intcode/*'), tracemalloc.Filter(True, __file__)]
+
+    class Probe(vm_class):
+        def _fetch_op(self):
+            self._before = tracemalloc.take_snapshot().filter_traces(filters) if tracemalloc.is_tracing() else None
+            super()._fetch_op()
+
+        def _fetch_params_by_mode(self, num_args, modes, writes):
+            vals = super()._fetch_params_by_mode(num_args, modes, writes)
+            if self._before is None:
+                return vals
+            after = tracemalloc.take_snapshot().filter_traces(filters)
+            for stat in after.compare_to(self._before, 'lineno'):
+                if stat.count_diff > 0:
+                    frame = stat.traceback[0]
+                    counts[f'{frame.filename.rsplit("/", 1)[-1]}:{frame.lineno}'] += stat.count_diff
+            return vals
+
+    intcode = Probe(code, inputs=inputs)
+    for _ in range(1000):
+        intcode._fetch_op()
+    tracemalloc.start()
+    for _ in range(steps):
+        intcode._fetch_op()
+    tracemalloc.stop()
+    return sum(counts.values()) / steps, {line: count / steps for line, count in counts.most_common()}
+
+
+if __name__ == "__main__":
+    with open('day9_input.txt', 'r') as infile:
+        code = [int(s) for s in infile.read().strip().split(',')]
+
+    for name, vm_class in [('slicing', SlicingIntcode), ('by index', Intcode)]:
+        per_step = transient_bytes_per_step(vm_class, code, [2], 50000)
+        blocks, by_line = blocks_per_step(vm_class, code, [2], 5000)
+        print(f'{name:>8}: {per_step:.1f} bytes allocated per instruction, {blocks:.2f} blocks held for its operation')
+        for line, count in by_line.items():
+            print(f'          {count:.2f} at {line}')
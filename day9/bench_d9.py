@@ -0,0 +1,50 @@
+from time import perf_counter
+
+from day9.intcode_d9 import Intcode, ReferenceIntcode, ThreadedIntcode, CompiledIntcode
+
+
+class CountingIntcode(Intcode):
+    """Intcode that counts executed instructions."""
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.steps = 0
+
+    def _fetch_op(self):
+        self.steps += 1
+        super()._fetch_op()
+
+
+def count_steps(code, inputs):
+    """Return the number of instructions executed running code with inputs."""
+    intcode = CountingIntcode(code, inputs=inputs)
+    intcode.run()
+    return intcode.steps
+
+
+def time_run(vm_class, code, inputs, repeats=3):
+    """Return the best wall time over [repeats] runs of code with inputs on vm_class."""
+    best = None
+    for _ in range(repeats):
+        intcode = vm_class(code, inputs=inputs)
+        start = perf_counter()
+        intcode.run()
+        elapsed = perf_counter() - start
+        if best is None or elapsed < best:
+            best = elapsed
+    return best
+
+
+if __name__ == "__main__":
+    with open('day9_input.txt', 'r') as infile:
+        code = [int(s) for s in infile.read().strip().split(',')]
+
+    # Part 2 runs the BOOST program in sensor boost mode (input 2)
+    steps = count_steps(code, [2])
+    print(f'Part 2: {steps} instructions')
+    engines = [('reference', ReferenceIntcode),
+               ('decode cache', Intcode),
+               ('threaded', ThreadedIntcode),
+               ('compiled', CompiledIntcode)]
+    for name, vm_class in engines:
+        elapsed = time_run(vm_class, code, [2])
+        print(f'{name:>14}: {elapsed:.3f}s, {steps / elapsed:,.0f} instructions/s')
@@ -0,0 +1,43 @@
+from time import perf_counter
+
+from day9.intcode_d9 import Intcode
+from intcode import parse_program
+
+
+class ListQueue(list):
+    """Inputs read from the front of a list, as before inputs were a RingBuffer. Each read is O(n)."""
+    def popleft(self):
+        return self.pop(0)
+
+
+class ListInputIntcode(Intcode):
+    def __init__(self, memory, inputs=None, **kwargs):
+        super().__init__(memory, **kwargs)
+        self.inputs = ListQueue(inputs or ())
+
+
+def echo_time(vm_class, values):
+    """Seconds to stream [values] inputs through a program that outputs each one."""
+    vm = vm_class(ECHO, inputs=list(range(values)))
+    start = perf_counter()
+    vm.run()
+    return perf_counter() - start
+
+
+# Outputs every input, forever
+ECHO = parse_program('3,100,4,100,1105,1,0')
+
+if __name__ == "__main__":
+    for values in (10**4, 10**5, 2 * 10**5):
+        for name, vm_class in [('list', ListInputIntcode), ('ring buffer', Intcode)]:
+            print(f'{name:>11}: {values} values in {echo_time(vm_class, values):.2f}s')
+
+    # A million values through bounded buffers, fed and drained 1000 at a time
+    vm = Intcode(ECHO, capacity=1000)
+    total = 0
+    start = perf_counter()
+    for _ in range(1000):
+        vm.add_inputs(range(1000))
+        vm.run()
+        total += len(vm.outputs.drain())
+    print(f'{total} values through 1000 value buffers in {perf_counter() - start:.2f}s')
@@ -0,0 +1,61 @@
+import tracemalloc
+
+from day9.intcode_d9 import Intcode
+
+
+class ListMem:
+    """The original list-backed memory: any access past the end extends the list with 0s."""
+    def __init__(self, content):
+        self._mem = content.copy()
+
+    def __getitem__(self, indices):
+        if type(indices) is slice:
+            max_ind = indices.stop - 1
+        else:
+            max_ind = indices
+        self._expand_mem(max_ind)
+        return self._mem[indices]
+
+    def __setitem__(self, index, value):
+        self._expand_mem(index)
+        self._mem[index] = value
+
+    def __len__(self):
+        return len(self._mem)
+
+    def _expand_mem(self, index):
+        if len(self._mem) < index + 1:
+            self._mem.extend([0]*(index - len(self._mem) + 1))
+
+
+class ListMemIntcode(Intcode):
+    def __init__(self, memory, **kwargs):
+        super().__init__(memory, **kwargs)
+        self.mem = ListMem(memory)
+
+
+def scatter_program(num_writes, stride):
+    """Program that writes num_writes values stride addresses apart, then outputs the last one."""
+    code = []
+    for i in range(1, num_writes + 1):
+        code += [1101, i, i, i * stride]
+    return code + [4, num_writes * stride, 99]
+
+
+def peak_memory(vm_class, code):
+    """Return (outputs, peak bytes allocated) running code on vm_class."""
+    tracemalloc.start()
+    intcode = vm_class(code)
+    intcode.run()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return intcode.outputs, peak
+
+
+if __name__ == "__main__":
+    for num_writes, stride in [(10, 1000), (100, 10000), (100, 100000)]:
+        code = scatter_program(num_writes, stride)
+        print(f'{num_writes} writes, {stride} addresses apart:')
+        for name, vm_class in [('list', ListMemIntcode), ('paged', Intcode)]:
+            outputs, peak = peak_memory(vm_class, code)
+            print(f'{name:>8}: peak {peak / 2**20:8.2f} MiB, outputs {outputs}')
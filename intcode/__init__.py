@@ -0,0 +1,50 @@
+"""Intcode virtual machine shared by every day's puzzle.
+
+Engines all take the same constructor arguments and expose the same run()/add_inputs()/
+snapshot()/fork() interface and state (mem, pointer, relative_base, inputs, outputs, halt):
+
+    reference   ReferenceIntcode    parses every instruction; the behaviour others are checked against
+    fast        Intcode             interpreter with a decoded-instruction cache
+    threaded    ThreadedIntcode     translates each instruction into a specialized closure
+    compiled    CompiledIntcode     compiles basic blocks into Python functions
+
+inputs and outputs are RingBuffers, optionally bounded by the capacity argument.
+
+intcode.aio runs engines as asyncio tasks connected by queues, and intcode.network schedules
+graphs of VMs by routing outputs to inputs and only running VMs that have new input.
+intcode.batch (needs NumPy) steps many instances of a program in lockstep for parameter sweeps.
+
+intcode.analysis disassembles a program and finds its basic blocks, loops and writes into code
+(``python -m intcode.disassemble program.txt`` prints it).
+CompiledIntcode precompiles programs it proves never modify themselves.
+intcode.trace records the last instructions a VM ran in a ring buffer for post-mortems, and
+intcode.profiler counts what a program executes, reads and writes, for finding its hot loops.
+
+Run ``python -m intcode.conformance`` to check every engine against the puzzle examples.
+"""
+from intcode.compiled import CompiledIntcode
+from intcode.interpreter import Intcode, Opcode, ReferenceIntcode, Snapshot, writer
+from intcode.memory import DynamicMem
+from intcode.ringbuffer import RingBuffer
+from intcode.threaded import ThreadedIntcode
+from intcode.trace import Tracer
+
+__version__ = '1.0.0'
+
+ENGINES = {'reference': ReferenceIntcode,
+           'fast': Intcode,
+           'threaded': ThreadedIntcode,
+           'compiled': CompiledIntcode}
+
+
+def get_engine(name):
+    """Return the Intcode class for engine [name]."""
+    try:
+        return ENGINES[name]
+    except KeyError:
+        raise ValueError(f'Unknown Intcode engine {name!r}. Choose from {", ".join(ENGINES)}') from None
+
+
+def parse_program(code_str):
+    """Return the list of ints in a comma-separated Intcode program."""
+    return [int(s) for s in code_str.strip().split(',')]
@@ -0,0 +1,83 @@
+"""Run Intcode VMs as asyncio tasks that talk through queues.
+
+Each AsyncIntcode reads its inputs from an inbox queue and puts its outputs on an outbox queue.
+Give one VM's outbox to another as its inbox to connect them; a VM waiting on an empty inbox
+is suspended by the event loop until a value arrives, so networks of VMs run without polling.
+"""
+import asyncio
+
+from intcode import get_engine
+
+
+class AsyncIntcode:
+    """Intcode VM whose run() is a coroutine reading inputs from inbox and writing outputs to outbox."""
+    def __init__(self, memory, inbox=None, outbox=None, engine='fast', debug=False):
+        self.vm = get_engine(engine)(memory, debug=debug)
+        self.inbox = asyncio.Queue() if inbox is None else inbox
+        self.outbox = asyncio.Queue() if outbox is None else outbox
+
+    @property
+    def halt(self):
+        return self.vm.halt
+
+    async def run(self):
+        """Run until the VM halts, waiting on the inbox whenever it needs input."""
+        vm = self.vm
+        while True:
+            vm.run()
+            held_on_output = vm.outputs.full()
+            for val in vm.outputs.drain():
+                await self.outbox.put(val)
+            if vm.halt:
+                return
+            if held_on_output:
+                continue
+
+            # Out of input. Wait for the next value, then take anything else already queued.
+            vm.add_inputs([await self.inbox.get()])
+            while not self.inbox.empty():
+                vm.add_inputs([self.inbox.get_nowait()])
+
+
+def connect(vms, feedback=False):
+    """Chain vms so each one's outbox is the next one's inbox. With feedback, the last feeds the first."""
+    for sender, receiver in zip(vms, vms[1:]):
+        receiver.inbox = sender.outbox
+    if feedback:
+        vms[-1].outbox = vms[0].inbox
+
+
+async def run_all(vms):
+    """Run vms concurrently until every one has halted."""
+    await asyncio.gather(*(vm.run() for vm in vms))
+
+
+async def amplifier_chain(code, phase_seq, feedback=False, engine='fast'):
+    """Return the final signal out of a chain of amplifiers running code, one per phase in phase_seq."""
+    amps = [AsyncIntcode(code, engine=engine) for _ in phase_seq]
+    connect(amps, feedback=feedback)
+    for amp, phase in zip(amps, phase_seq):
+        amp.inbox.put_nowait(phase)
+    amps[0].inbox.put_nowait(0)
+    await run_all(amps)
+    # With feedback, the last signal ends up waiting in the first amp's inbox
+    return amps[-1].outbox.get_nowait()
+
+
+if __name__ == "__main__":
+    from intcode import parse_program
+    from itertools import permutations
+    from time import perf_counter
+
+    with open('day7/day7_input.txt', 'r') as infile:
+        code = parse_program(infile.read())
+
+    best = max(asyncio.run(amplifier_chain(code, seq, feedback=True)) for seq in permutations(range(5, 10)))
+    print(f'Day 7 part 2: {best}')
+
+    # A long feedback ring of amplifiers, all running in one event loop
+    num_amps = 500
+    phases = [5 + i % 5 for i in range(num_amps)]
+    start = perf_counter()
+    signal = asyncio.run(amplifier_chain(code, phases, feedback=True))
+    print(f'{num_amps} amplifier ring: {len(str(signal))} digit signal in {perf_counter() - start:.2f}s')
@@ -0,0 +1,172 @@
+"""Amplifier chains (day 7): one VM per phase setting, each feeding its output signal to the next."""
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from itertools import islice, permutations
+from os import cpu_count
+
+from intcode import get_engine
+from intcode.network import Network
+
+# Amplifier program booted up to its first input, set per worker process by _init_worker
+_boot = None
+
+
+def boot(code, engine='fast'):
+    """Return a VM that has run code up to its first input. Amps are forked from it."""
+    amp = get_engine(engine)(code)
+    amp.run()
+    return amp
+
+
+def run_chain(booted, phase_seq, feedback=False, signal=0):
+    """Return the final output signal of a chain of amps forked from booted, one per phase.
+
+    Without feedback the signal passes through the chain once. With feedback the last amp's
+    output goes back to the first until the amps halt.
+    """
+    network = Network()
+    for i, phase in enumerate(phase_seq):
+        amp = booted.fork()
+        amp.add_inputs([phase])
+        network.add(i, amp)
+        if i > 0:
+            network.connect(i - 1, i)
+    last = len(phase_seq) - 1
+    if feedback:
+        network.connect(last, 0)
+
+    network.send(0, [signal])
+    network.run()
+    if feedback:
+        # The first amp has halted, so the last signal is left in its inputs
+        return network.nodes[0].vm.inputs[-1]
+    return network.nodes[last].vm.outputs[-1]
+
+
+def sweep(code, phases, feedback=False, num_amps=None, processes=None, chunk_size=1000, engine='fast'):
+    """Return (phase sequence, signal) for the highest signal over every ordering of phases.
+
+    num_amps amplifiers (default: one per phase) are chained for each permutation of phases.
+    Permutations are generated lazily in chunks of chunk_size and spread across [processes]
+    worker processes, keeping only a few chunks in flight and a running maximum, so memory
+    stays flat however many permutations there are.
+    """
+    phases = list(phases)
+    if num_amps is None:
+        num_amps = len(phases)
+    if processes is None:
+        processes = cpu_count()
+    seqs = permutations(phases, num_amps)
+    chunks = iter(lambda: list(islice(seqs, chunk_size)), [])
+
+    best = None
+    if processes == 1:
+        _init_worker(code, engine)
+        for chunk in chunks:
+            best = _better(best, _sweep_chunk(chunk, feedback))
+        return best
+
+    with ProcessPoolExecutor(processes, initializer=_init_worker, initargs=(code, engine)) as executor:
+        pending = set()
+        for chunk in chunks:
+            pending.add(executor.submit(_sweep_chunk, chunk, feedback))
+            if len(pending) >= 2 * processes:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    best = _better(best, future.result())
+        for future in pending:
+            best = _better(best, future.result())
+    return best
+
+
+class StageMemo:
+    """Output signal of one amp in a chain without feedback, memoized by (phase, input signal).
+
+    Every amp runs the same code, so a stage's output only depends on its phase and input.
+    Each miss resumes a fork of the program booted up to its first input.
+    """
+    def __init__(self, code, engine='fast'):
+        self.booted = boot(code, engine)
+        self.signals = {}
+        self.vm_runs = 0
+
+    def __call__(self, phase, signal):
+        key = (phase, signal)
+        try:
+            return self.signals[key]
+        except KeyError:
+            amp = self.booted.fork()
+            amp.add_inputs([phase, signal])
+            amp.run()
+            self.vm_runs += 1
+            out = self.signals[key] = amp.outputs[-1]
+            return out
+
+
+def sweep_prefix(code, phases, num_amps=None, engine='fast', stage=None, signal=0):
+    """Return (phase sequence, signal) for the highest signal out of a chain without feedback.
+
+    Walks the tree of phase permutations depth first, so the signal out of a prefix of the chain
+    is computed once for every sequence that starts with it, and each stage goes through a
+    StageMemo (pass your own as stage to inspect vm_runs afterwards).
+    """
+    phases = list(phases)
+    if num_amps is None:
+        num_amps = len(phases)
+    if stage is None:
+        stage = StageMemo(code, engine)
+
+    best = None
+    # Stack of (phase sequence so far, phases left to use, signal out of the sequence so far)
+    stack = [((), phases, signal)]
+    while stack:
+        prefix, remaining, prefix_signal = stack.pop()
+        if len(prefix) == num_amps:
+            best = _better(best, (prefix, prefix_signal))
+            continue
+        for i, phase in enumerate(remaining):
+            stack.append((prefix + (phase,), remaining[:i] + remaining[i+1:], stage(phase, prefix_signal)))
+    return best
+
+
+def _better(a, b):
+    """Return whichever (phase sequence, signal) result has the higher signal."""
+    if a is None or (b is not None and b[1] > a[1]):
+        return b
+    return a
+
+
+def _init_worker(code, engine):
+    global _boot
+    _boot = boot(code, engine)
+
+
+def _sweep_chunk(chunk, feedback):
+    """Return the best (phase sequence, signal) in a chunk of phase sequences."""
+    best = None
+    for phase_seq in chunk:
+        best = _better(best, (phase_seq, run_chain(_boot, phase_seq, feedback)))
+    return best
+
+
+if __name__ == "__main__":
+    from intcode import parse_program
+    from time import perf_counter
+
+    with open('day7/day7_input.txt', 'r') as infile:
+        code = parse_program(infile.read())
+
+    stage = StageMemo(code)
+    print(f'Part 1: {sweep_prefix(code, range(5), stage=stage)}, {stage.vm_runs} VM runs instead of {5 * 120}')
+    print(f'Part 2: {sweep(code, range(5, 10), feedback=True)}')
+
+    # Nine amps that add their phase to the signal, saturating at 30, so many prefixes
+    # end in the same signal
+    saturating = parse_program('3,100,3,101,1,100,101,102,1007,102,30,103,1005,103,19,1101,0,30,102,4,102,99')
+    stage = StageMemo(saturating)
+    start = perf_counter()
+    print(f'9 saturating amps: {sweep_prefix(saturating, range(9), stage=stage)} in '
+          f'{perf_counter() - start:.1f}s, {stage.vm_runs} VM runs instead of {9 * 362880}')
+
+    # Seven amplifiers over phases 0-6: 5,040 chains
+    start = perf_counter()
+    print(f'7 amps: {sweep(code, range(7), engine="threaded")} in {perf_counter() - start:.1f}s')
@@ -0,0 +1,313 @@
+"""Static analysis of Intcode programs: disassembly, basic blocks, control flow, loops, and writes.
+
+    analysis = analyze(code)
+    print(analysis.listing())
+    if not analysis.modifies_code:
+        vm = CompiledIntcode(code, analysis=analysis)   # Precompiled, without self-modification checks
+
+Code is found by following control flow from address 0. Jumps to computed addresses are taken
+to go to the return addresses programs store for themselves: constants equal to the address
+right after a jump. That is a guess, so a program with any computed jump is never said to
+leave its code alone or to have unreachable code: it could jump to code that wasn't found.
+
+The lowest value the relative base can have at each instruction is tracked too, which is how
+relative-mode writes (usually to a stack past the end of the program) are shown to miss code.
+
+Print the analysis of a program file with ``python -m intcode.disassemble program.txt``.
+"""
+from collections import namedtuple
+
+from intcode.trace import OPCODE_NAMES
+
+# Opcode number -> (number of parameters, whether the last one is a write address)
+SIGNATURES = {1: (3, True), 2: (3, True), 3: (1, True), 4: (1, False), 5: (2, False), 6: (2, False),
+              7: (3, True), 8: (3, True), 9: (1, False), 99: (0, False)}
+
+# Instructions that end a basic block, matching CompiledIntcode's blocks
+BLOCK_ENDS = {3, 5, 6, 99}
+
+# Updates to one instruction's relative base lower bound before giving up on bounding it
+_MAX_BOUND_UPDATES = 100
+
+Instruction = namedtuple('Instruction', ['address', 'value', 'opcode', 'modes', 'params'])
+BasicBlock = namedtuple('BasicBlock', ['start', 'end', 'instructions', 'successors'])
+Loop = namedtuple('Loop', ['header', 'latches', 'blocks'])
+# target is None when the write's address can't be bounded away from code
+Write = namedtuple('Write', ['address', 'target'])
+
+
+def decode(code, address):
+    """Return the Instruction at address in code, or None if it isn't a valid instruction."""
+    if not 0 <= address < len(code):
+        return None
+    value = code[address]
+    opcode = value % 100
+    if value < 0 or opcode not in SIGNATURES:
+        return None
+    num_args, writes = SIGNATURES[opcode]
+    if address + num_args >= len(code):
+        return None
+    modes = tuple(value // 10**(i + 2) % 10 for i in range(num_args))
+    if any(mode > 2 for mode in modes) or (writes and modes[-1] == 1):
+        return None
+    return Instruction(address, value, opcode, modes, tuple(code[address + 1:address + 1 + num_args]))
+
+
+def format_instruction(ins):
+    """Return one line of assembly for an Instruction."""
+    operands = []
+    for param, mode in zip(ins.params, ins.modes):
+        if mode == 0:
+            operands.append(f'[{param}]')
+        elif mode == 1:
+            operands.append(str(param))
+        else:
+            operands.append(f'[rb{param:+}]')
+    return f'{ins.address:>6}: {OPCODE_NAMES[ins.opcode]:<5}{", ".join(operands)}'
+
+
+class Analysis:
+    """Everything analyze() finds out about a program."""
+    def __init__(self, code, instructions, blocks, loops, rb_bounds, writes):
+        self.code = code
+        self.instructions = instructions    # address -> Instruction, for reachable code
+        self.blocks = blocks                # start address -> BasicBlock
+        self.loops = loops                  # [Loop]
+        self.rb_bounds = rb_bounds          # address -> lowest relative base there (or -inf)
+        self.writes = writes                # [Write] for writes that may land in code
+        self.computed_jumps = sorted(a for a, ins in instructions.items()
+                                     if ins.opcode in (5, 6) and ins.modes[1] != 1)
+        self.code_cells = frozenset(a for ins in instructions.values()
+                                    for a in range(ins.address, ins.address + len(ins.params) + 1))
+
+    @property
+    def modifies_code(self):
+        """False if no instruction can write into code.
+
+        Only a program without computed jumps can be shown not to, since only then is all of its
+        code known to have been found.
+        """
+        return bool(self.writes) or bool(self.computed_jumps)
+
+    def constant_jumps(self):
+        """Return {address: target} for jumps whose outcome is fixed. target is None if never taken."""
+        jumps = {}
+        for ins in self.instructions.values():
+            if ins.opcode in (5, 6) and ins.modes[0] == 1:
+                taken = bool(ins.params[0]) == (ins.opcode == 5)
+                jumps[ins.address] = (ins.params[1] if ins.modes[1] == 1 else 'indirect') if taken else None
+        return jumps
+
+    def unreachable(self):
+        """Return (start, end) ranges of the image that no reachable instruction covers.
+
+        Returns None if the program has computed jumps, since they may reach code that wasn't found.
+        """
+        if self.computed_jumps:
+            return None
+        ranges = []
+        start = None
+        for address in range(len(self.code) + 1):
+            covered = address in self.code_cells or address == len(self.code)
+            if not covered and start is None:
+                start = address
+            elif covered and start is not None:
+                ranges.append((start, address))
+                start = None
+        return ranges
+
+    def listing(self):
+        """Return a disassembly of the reachable code by basic block, with loops marked."""
+        headers = {loop.header for loop in self.loops}
+        lines = []
+        for start, block in sorted(self.blocks.items()):
+            loop_note = '  (loop header)' if start in headers else ''
+            lines.append(f'block {start}-{block.end - 1} -> {sorted(block.successors)}{loop_note}')
+            lines += ['  ' + format_instruction(ins) for ins in block.instructions]
+        return '\n'.join(lines)
+
+    def summary(self):
+        return (f'{len(self.instructions)} instructions in {len(self.blocks)} blocks, {len(self.loops)} loops, '
+                f'{len(self.constant_jumps())} constant jumps, {len(self.computed_jumps)} computed jumps, '
+                f'{"unknown" if self.unreachable() is None else len(self.unreachable())} unreachable ranges, '
+                f'{"may modify" if self.modifies_code else "never modifies"} its code')
+
+
+def analyze(code):
+    """Return an Analysis of the program image code."""
+    code = list(code)
+    instructions, jump_targets, return_addresses = _reachable(code)
+    blocks = _blocks(instructions, jump_targets, return_addresses)
+    loops = _loops(blocks)
+    rb_bounds = _rb_bounds(instructions, return_addresses)
+    writes = _code_writes(instructions, rb_bounds)
+    return Analysis(code, instructions, blocks, loops, rb_bounds, writes)
+
+
+def _successors(ins, return_addresses):
+    """Addresses control can go to after ins. Computed jumps may go to any return address."""
+    if ins.opcode == 99:
+        return []
+    next_address = ins.address + len(ins.params) + 1
+    if ins.opcode not in (5, 6):
+        return [next_address]
+
+    cond_mode, target_mode = ins.modes
+    cond, target = ins.params
+    targets = [target] if target_mode == 1 else list(return_addresses)
+    if cond_mode != 1:
+        return [next_address] + targets
+    return targets if bool(cond) == (ins.opcode == 5) else [next_address]
+
+
+def _reachable(code):
+    """Follow control flow from 0. Returns ({address: Instruction}, {jump targets}, {return addresses})."""
+    instructions = {}
+    return_addresses = set()
+    changed = True
+    while changed:
+        # Start over whenever new return addresses turn up, so computed jumps reach them
+        instructions = {}
+        jump_targets = {0}
+        stack = [0]
+        while stack:
+            address = stack.pop()
+            if address in instructions:
+                continue
+            ins = decode(code, address)
+            if ins is None:
+                continue
+            instructions[address] = ins
+            successors = _successors(ins, return_addresses)
+            if ins.opcode in (5, 6):
+                jump_targets.update(s for s in successors if s != address + 3)
+            stack.extend(successors)
+
+        after_jumps = {a + 3 for a, ins in instructions.items() if ins.opcode in (5, 6)}
+        constants = {p for ins in instructions.values()
+                     for p, mode in zip(ins.params, ins.modes) if mode == 1}
+        found = (after_jumps & constants) - return_addresses
+        return_addresses |= found
+        changed = bool(found)
+    return instructions, jump_targets | return_addresses, return_addresses
+
+
+def _blocks(instructions, jump_targets, return_addresses):
+    """Split reachable instructions into BasicBlocks keyed by start address."""
+    leaders = {a for a in jump_targets if a in instructions}
+    for ins in instructions.values():
+        if ins.opcode in BLOCK_ENDS:
+            leaders.add(ins.address + len(ins.params) + 1)
+
+    blocks = {}
+    for start in sorted(a for a in leaders if a in instructions):
+        block = []
+        address = start
+        while True:
+            ins = instructions[address]
+            block.append(ins)
+            address += len(ins.params) + 1
+            if ins.opcode in BLOCK_ENDS or address in leaders or address not in instructions:
+                break
+        blocks[start] = block
+
+    result = {}
+    for start, block in blocks.items():
+        last = block[-1]
+        successors = {s for s in _successors(last, return_addresses) if s in blocks}
+        result[start] = BasicBlock(start, last.address + len(last.params) + 1, block, frozenset(successors))
+    return result
+
+
+def _loops(blocks):
+    """Find natural loops from the back edges of a depth-first walk of the blocks from 0.
+
+    Loops with the same header are merged. Returns through computed jumps aren't loop edges,
+    but recursive calls are, so a recursive function shows up as a loop.
+    """
+    if 0 not in blocks:
+        return []
+    edges = {}
+    for start, block in blocks.items():
+        last = block.instructions[-1]
+        if last.opcode in (5, 6) and last.modes[1] != 1:
+            edges[start] = sorted(block.successors & {block.end})
+        else:
+            edges[start] = sorted(block.successors)
+    back_edges = []
+    on_stack = {0}
+    visited = {0}
+    stack = [(0, iter(edges[0]))]
+    while stack:
+        node, successors = stack[-1]
+        for succ in successors:
+            if succ in on_stack:
+                back_edges.append((node, succ))
+            elif succ not in visited:
+                visited.add(succ)
+                on_stack.add(succ)
+                stack.append((succ, iter(edges[succ])))
+                break
+        else:
+            stack.pop()
+            on_stack.discard(node)
+
+    predecessors = {start: set() for start in blocks}
+    for start in blocks:
+        for succ in edges[start]:
+            predecessors[succ].add(start)
+
+    latches = {}
+    for latch, header in back_edges:
+        latches.setdefault(header, set()).add(latch)
+    loops = []
+    for header, header_latches in sorted(latches.items()):
+        body = {header} | header_latches
+        work = list(header_latches)
+        while work:
+            for pred in predecessors[work.pop()]:
+                if pred not in body:
+                    body.add(pred)
+                    work.append(pred)
+        loops.append(Loop(header, frozenset(header_latches), frozenset(body)))
+    return loops
+
+
+def _rb_bounds(instructions, return_addresses):
+    """Return {address: lowest relative base on entry} for reachable instructions."""
+    if 0 not in instructions:
+        return {}
+    bounds = {0: 0}
+    updates = {}
+    work = [0]
+    while work:
+        address = work.pop()
+        ins = instructions[address]
+        rb = bounds[address]
+        if ins.opcode == 9:
+            rb = rb + ins.params[0] if ins.modes[0] == 1 else float('-inf')
+        for succ in _successors(ins, return_addresses):
+            if succ not in instructions or bounds.get(succ, float('inf')) <= rb:
+                continue
+            updates[succ] = updates.get(succ, 0) + 1
+            bounds[succ] = rb if updates[succ] <= _MAX_BOUND_UPDATES else float('-inf')
+            work.append(succ)
+    return bounds
+
+
+def _code_writes(instructions, rb_bounds):
+    """Return a Write for every instruction that may write into code."""
+    code_cells = {a for ins in instructions.values() for a in range(ins.address, ins.address + len(ins.params) + 1)}
+    code_end = max(code_cells, default=-1) + 1
+    writes = []
+    for ins in instructions.values():
+        if not SIGNATURES[ins.opcode][1]:
+            continue
+        target = ins.params[-1]
+        if ins.modes[-1] == 0:
+            if target in code_cells:
+                writes.append(Write(ins.address, target))
+        elif rb_bounds.get(ins.address, float('-inf')) + target < code_end:
+            writes.append(Write(ins.address, None))
+    return writes
+
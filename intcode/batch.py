@@ -0,0 +1,239 @@
+"""Run many instances of an Intcode program in lockstep with NumPy. Requires numpy.
+
+The memories of N instances are rows of one 2-D int64 array. Each step, instances are grouped by
+instruction pointer and instruction value, and every group runs its instruction for all of its
+instances at once by gathering operands from their rows and scattering results back. Instances
+whose control flow diverges just end up in different groups. Made for parameter sweeps such as
+day 2's noun/verb search or day 7's phase settings, where most instances follow the same path.
+
+Values are machine integers: an add or multiply that overflows 64 bits raises OverflowError.
+"""
+import numpy as np
+
+from intcode.interpreter import Intcode
+
+# Opcode number -> (number of parameters, whether the last one is a write address)
+_SIGNATURES = {num: (op.num_args, hasattr(op.func, '_writer')) for num, op in Intcode._OPCODES.items()}
+
+
+class BatchIntcode:
+    """N Intcode VMs stepped together. Each has its own memory, pointer, relative base and I/O.
+
+    memories is a sequence of N programs (they may differ and differ in length) or a 2-D array.
+    Every memory gets mem_size cells (default: the longest program plus EXTRA_MEMORY).
+    inputs is an optional sequence of N input sequences.
+    """
+    EXTRA_MEMORY = 1024
+
+    def __init__(self, memories, inputs=None, mem_size=None):
+        lengths = [len(m) for m in memories]
+        if mem_size is None:
+            mem_size = max(lengths) + self.EXTRA_MEMORY
+        num = len(lengths)
+        self.mem = np.zeros((num, mem_size), dtype=np.int64)
+        for i, memory in enumerate(memories):
+            self.mem[i, :lengths[i]] = memory
+
+        self.pointer = np.zeros(num, dtype=np.int64)
+        self.relative_base = np.zeros(num, dtype=np.int64)
+        self.halt = np.zeros(num, dtype=bool)
+        self.hold_for_input = np.zeros(num, dtype=bool)
+        self.group_steps = 0    # Number of grouped instructions run, however many instances each
+
+        # Inputs and outputs are 2-D arrays with a read position or count per instance
+        self._inputs = np.zeros((num, 0), dtype=np.int64)
+        self._input_count = np.zeros(num, dtype=np.int64)
+        self._input_pos = np.zeros(num, dtype=np.int64)
+        self._outputs = np.zeros((num, 4), dtype=np.int64)
+        self._output_count = np.zeros(num, dtype=np.int64)
+        if inputs is not None:
+            self.add_inputs(inputs)
+
+    def __len__(self):
+        return len(self.pointer)
+
+    def add_inputs(self, inputs):
+        """Add inputs[i] (a sequence, or a single value) to the inputs of instance i, for every instance."""
+        rows = [np.atleast_1d(np.asarray(row, dtype=np.int64)) for row in inputs]
+        if len(rows) != len(self):
+            raise ValueError(f'Expected inputs for {len(self)} instances, got {len(rows)}')
+        needed = int(max(self._input_count + [len(row) for row in rows]))
+        if needed > self._inputs.shape[1]:
+            grown = np.zeros((len(self), needed), dtype=np.int64)
+            grown[:, :self._inputs.shape[1]] = self._inputs
+            self._inputs = grown
+        for i, row in enumerate(rows):
+            count = self._input_count[i]
+            self._inputs[i, count:count + len(row)] = row
+            self._input_count[i] += len(row)
+
+    def outputs(self, i):
+        """Return the outputs of instance i so far."""
+        return self._outputs[i, :self._output_count[i]].tolist()
+
+    def last_outputs(self):
+        """Return an array of every instance's last output. Instances without outputs get 0."""
+        last = np.maximum(self._output_count - 1, 0)
+        return np.where(self._output_count > 0, self._outputs[np.arange(len(self)), last], 0)
+
+    def run(self):
+        """Run every instance until it halts or runs out of inputs."""
+        self.hold_for_input[:] = False
+        mem = self.mem
+        while True:
+            active = np.flatnonzero(~self.halt & ~self.hold_for_input)
+            if not len(active):
+                break
+            pointers = self.pointer[active]
+            instructions = mem[active, pointers]
+            keys, group_of = np.unique(np.stack([pointers, instructions], axis=1), axis=0, return_inverse=True)
+            group_of = group_of.reshape(-1)
+            if len(keys) == 1:
+                self._step(active, int(keys[0, 0]), int(keys[0, 1]))
+            else:
+                for k, (pointer, value) in enumerate(keys.tolist()):
+                    self._step(active[group_of == k], pointer, value)
+
+    def _step(self, idx, pointer, value):
+        """Run the instruction [value] at [pointer] for the instances in idx."""
+        self.group_steps += 1
+        mem = self.mem
+        opcode = value % 100
+        try:
+            num_args, writes = _SIGNATURES[opcode]
+        except KeyError:
+            raise ValueError(f'Unknown opcode {value} at {pointer}') from None
+        modes = (value // 100 % 10, value // 1000 % 10, value // 10000 % 10)
+        params = [mem[idx, pointer + 1 + i] for i in range(num_args)]
+
+        num_reads = num_args - 1 if writes else num_args
+        reads = []
+        for param, mode in zip(params[:num_reads], modes):
+            if mode == 0:       # Position mode
+                reads.append(mem[idx, self._checked(param)])
+            elif mode == 1:     # Immediate mode
+                reads.append(param)
+            else:               # Relative mode
+                reads.append(mem[idx, self._checked(param + self.relative_base[idx])])
+        target = None
+        if writes:
+            if modes[num_reads] == 0:
+                target = self._checked(params[-1])
+            elif modes[num_reads] == 2:
+                target = self._checked(params[-1] + self.relative_base[idx])
+            else:
+                raise ValueError('Memory write in immediate mode')
+
+        next_pointer = pointer + num_args + 1
+        if opcode == 1:
+            a, b = reads
+            result = a + b
+            if ((a ^ result) & (b ^ result) < 0).any():
+                raise OverflowError(f'Add at {pointer} overflowed 64 bits')
+            mem[idx, target] = result
+        elif opcode == 2:
+            a, b = reads
+            result = a * b
+            nonzero = b != 0
+            smallest = np.iinfo(np.int64).min
+            # Dividing back also overflows for smallest // -1, so that case is checked directly
+            with np.errstate(over='ignore'):
+                wrapped = nonzero & (result // np.where(nonzero, b, 1) != a)
+            if (wrapped | ((a == -1) & (b == smallest)) | ((a == smallest) & (b == -1))).any():
+                raise OverflowError(f'Multiply at {pointer} overflowed 64 bits')
+            mem[idx, target] = result
+        elif opcode == 3:
+            has_input = self._input_pos[idx] < self._input_count[idx]
+            self.hold_for_input[idx[~has_input]] = True
+            idx, target = idx[has_input], target[has_input]
+            mem[idx, target] = self._inputs[idx, self._input_pos[idx]]
+            self._input_pos[idx] += 1
+        elif opcode == 4:
+            if int(self._output_count[idx].max()) >= self._outputs.shape[1]:
+                self._outputs = np.concatenate([self._outputs, np.zeros_like(self._outputs)], axis=1)
+            self._outputs[idx, self._output_count[idx]] = reads[0]
+            self._output_count[idx] += 1
+        elif opcode == 5:
+            self.pointer[idx] = np.where(reads[0] != 0, reads[1], next_pointer)
+            return
+        elif opcode == 6:
+            self.pointer[idx] = np.where(reads[0] == 0, reads[1], next_pointer)
+            return
+        elif opcode == 7:
+            mem[idx, target] = reads[0] < reads[1]
+        elif opcode == 8:
+            mem[idx, target] = reads[0] == reads[1]
+        elif opcode == 9:
+            self.relative_base[idx] += reads[0]
+        elif opcode == 99:
+            self.halt[idx] = True
+            return
+        self.pointer[idx] = next_pointer
+
+    def _checked(self, addresses):
+        """Return addresses, after checking they are all in memory. NumPy would wrap negative ones."""
+        if (addresses < 0).any():
+            raise IndexError('Negative memory address')
+        if (addresses >= self.mem.shape[1]).any():
+            raise IndexError(f'Memory address {int(addresses.max())} is past mem_size={self.mem.shape[1]}')
+        return addresses
+
+
+def sweep_mem0(code, nouns, verbs):
+    """Return a (nouns x verbs) array of mem[0] after running a day 2 program for every noun and verb."""
+    nouns, verbs = list(nouns), list(verbs)
+    memories = np.tile(np.asarray(code, dtype=np.int64), (len(nouns) * len(verbs), 1))
+    memories[:, 1] = np.repeat(nouns, len(verbs))
+    memories[:, 2] = np.tile(verbs, len(nouns))
+    batch = BatchIntcode(memories, mem_size=len(code))
+    batch.run()
+    return batch.mem[:, 0].reshape(len(nouns), len(verbs))
+
+
+def amplifier_signals(code, phase_seqs, signal=0):
+    """Return an array of the signal out of a chain of amps without feedback, for each phase sequence.
+
+    Every sequence's amps at the same position in the chain run as one batch.
+    """
+    phase_seqs = np.asarray(phase_seqs, dtype=np.int64)
+    signals = np.full(len(phase_seqs), signal, dtype=np.int64)
+    for stage in range(phase_seqs.shape[1]):
+        batch = BatchIntcode([code] * len(phase_seqs), inputs=np.stack([phase_seqs[:, stage], signals], axis=1))
+        batch.run()
+        signals = batch.last_outputs()
+    return signals
+
+
+if __name__ == "__main__":
+    from itertools import permutations
+    from time import perf_counter
+
+    from intcode import parse_program
+    from intcode.amplifiers import run_chain, boot
+
+    with open('day2/input_day2.txt', 'r') as infile:
+        code = parse_program(infile.read())
+    start = perf_counter()
+    mem0 = sweep_mem0(code, range(100), range(100))
+    noun, verb = np.argwhere(mem0 == 19690720)[0]
+    print(f'Day 2: 10000 instances in {perf_counter() - start:.2f}s, answer {100 * noun + verb}')
+
+    start = perf_counter()
+    for noun in range(100):
+        for verb in range(100):
+            vm = Intcode(code)
+            vm.mem[1], vm.mem[2] = noun, verb
+            vm.run()
+    print(f'        one VM at a time: {perf_counter() - start:.2f}s')
+
+    with open('day7/day7_input.txt', 'r') as infile:
+        code = parse_program(infile.read())
+    phase_seqs = list(permutations(range(7), 5))
+    start = perf_counter()
+    signals = amplifier_signals(code, phase_seqs)
+    print(f'Day 7: {len(phase_seqs)} chains in {perf_counter() - start:.2f}s, best {signals.max()}')
+
+    start = perf_counter()
+    booted = boot(code)
+    best = max(run_chain(booted, seq) for seq in phase_seqs)
+    print(f'        one chain at a time: {perf_counter() - start:.2f}s, best {best}')
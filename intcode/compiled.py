@@ -0,0 +1,277 @@
+from collections import OrderedDict
+
+from intcode.analysis import decode
+from intcode.threaded import ThreadedIntcode
+
+
+class CompiledIntcode(ThreadedIntcode):
+    """Intcode that compiles straight-line runs of instructions into Python functions.
+
+    A basic block starts wherever the pointer lands and runs up to and including the next
+    jump, input, or halt. Its source has every operand inlined as a constant and position
+    mode reads indexed straight into the memory image, and it is compiled once and cached
+    by start address. Position mode writes into the image are stored straight into it too,
+    while it holds 64 bit ints; a result that overflows falls back to the memory's own
+    promotion to Python ints. Writes into a block's address range drop the block; if a block
+    writes into code, it returns right after that write so execution continues on the new code.
+
+    Given an intcode.analysis.Analysis of the program that shows it never modifies its code,
+    every basic block it found is compiled up front, without checking writes for code.
+
+    Adds and multiplies with an identity operand compile to moves, and ones with two
+    immediate operands to constants. A block that is a counting loop (a counter stepped by a
+    constant and tested against a constant, with the rest of the body adding constants or
+    loop-invariant cells to other cells) gets a prologue that works out the iteration count
+    and applies every update in closed form. Like any block, it is dropped if its code is
+    written to.
+
+    A start address whose block keeps being dropped is compiled at most MAX_COMPILES times;
+    after that it runs one threaded instruction at a time, since code that rewrites itself
+    every pass would otherwise be recompiled every pass.
+    """
+    _BLOCK_ENDS = {3, 5, 6, 99}
+    MAX_BLOCK_LEN = 100
+    MAX_COMPILES = 4
+    MAX_CACHED_BLOCKS = 1024
+
+    def __init__(self, memory, interactive=False, inputs=None, debug=False, capacity=None, tracer=None,
+                 analysis=None):
+        super().__init__(memory, interactive=interactive, inputs=inputs, debug=debug, capacity=capacity,
+                         tracer=tracer)
+        self._analysis = None
+        self._compiles = {}     # block start address -> times compiled
+        if analysis is not None and not analysis.modifies_code:
+            if self.mem[0:len(analysis.code)] != analysis.code:
+                raise ValueError('analysis is of a different program')
+            self._analysis = analysis
+            for start in analysis.blocks:
+                self._translate(start)
+
+    def _translate(self, address):
+        """Compile, store, and return the basic block starting at address."""
+        compiles = self._compiles.get(address, 0)
+        if compiles >= self.MAX_COMPILES:
+            return super()._translate(address)
+        self._compiles[address] = compiles + 1
+
+        # Code the analysis covers can't be written to, so its writes skip the check
+        guard_writes = self._analysis is None or address not in self._analysis.instructions
+        lines = self._counting_loop_lines(address)
+        pointer = address
+        for _ in range(self.MAX_BLOCK_LEN):
+            if pointer >= len(self.mem):
+                break
+            try:
+                opcode, body, next_pointer = self._block_lines(pointer, guard_writes)
+            except (KeyError, ValueError):
+                if pointer == address:
+                    raise
+                # Not a valid instruction. Leave it for the interpreter to fail
+                # on if execution actually reaches it.
+                break
+            lines.append(f'# {pointer}: {self.mem[pointer:next_pointer]}')
+            lines.extend(body)
+            pointer = next_pointer
+            if opcode in self._BLOCK_ENDS:
+                break
+        if not lines:
+            # Past the end of the image: run it as a single threaded instruction,
+            # which fails (or not) the same way the interpreter does
+            return super()._translate(address)
+        if not lines[-1].startswith('return'):
+            lines.append(f'return {pointer}')
+
+        # Blocks that store into the image directly need their own copy of it
+        writes_image = any(line.startswith('    m[') for line in lines)
+        src = ('def factory(vm, mem, cells):\n'
+               '    def block():\n' +
+               ('        m = mem.writable_image()\n' if writes_image else '        m = mem._image\n') +
+               ''.join(f'        {line}\n' for line in lines) +
+               '    return block\n')
+        cache = self._BLOCK_CACHE
+        try:
+            code = cache[src]
+            cache.move_to_end(src)
+        except KeyError:
+            code = compile(src, f'<intcode block {address}>', 'exec')
+            cache[src] = code
+            if len(cache) > self.MAX_CACHED_BLOCKS:
+                cache.popitem(last=False)
+        namespace = {}
+        exec(code, namespace)
+        block = namespace['factory'](self, self.mem, self._code_cells)
+        self._add_code(address, block, range(address, pointer))
+        return block
+
+    def _block_lines(self, address, guard_writes=True):
+        """Returns (opcode number, source lines, next address) for the instruction at address.
+
+        Without guard_writes, writes don't check whether they land on translated code.
+        """
+        opcode_val = self.mem[address]
+        opcode, param_modes, writes = self._decode(opcode_val)
+        next_address = address + opcode.num_args + 1
+        params = self.mem[address+1:next_address]
+        size = len(self.mem._image)
+
+        reads = []
+        for param, mode in zip(params, param_modes):
+            if mode == 0:       # Position mode
+                reads.append(f'm[{param}]' if 0 <= param < size else f'mem[{param}]')
+            elif mode == 1:     # Immediate mode
+                reads.append(str(param))
+            else:               # Relative mode
+                reads.append(f'mem[vm.relative_base + {param}]')
+        target = None
+        if writes:
+            if param_modes[-1] == 0:
+                target = str(params[-1])
+            elif param_modes[-1] == 2:
+                target = f'vm.relative_base + {params[-1]}'
+            else:
+                raise ValueError('Memory write in immediate mode')
+
+        if target is not None and target.isdigit() and int(target) < size:
+            store = lambda value: self._image_store(target, value, next_address)
+        else:
+            store = lambda value: self._store(target, value, next_address)
+        if not guard_writes:
+            guarded_store = store
+            store = lambda value: guarded_store(value)[:-3]     # Drop the 'if target in cells' lines
+        if opcode_val % 100 in (1, 2):
+            body = store(self._arithmetic(opcode_val % 100, *reads[:2]))
+        else:
+            body = self._OP_BODIES[opcode.func](reads, store, address)
+        return opcode_val % 100, body, next_address
+
+    @staticmethod
+    def _arithmetic(opcode, a, b):
+        """Source for a + b (opcode 1) or a * b (opcode 2), simplified when an operand is constant."""
+        if a.lstrip('-').isdigit() and b.lstrip('-').isdigit():
+            return str(int(a) + int(b) if opcode == 1 else int(a) * int(b))
+        identity = '0' if opcode == 1 else '1'
+        if a == identity:
+            return b
+        if b == identity:
+            return a
+        return f'{a} + {b}' if opcode == 1 else f'{a} * {b}'
+
+    def _counting_loop_lines(self, address):
+        """Source lines that run the counting loop at address to its end in one go.
+
+        Returns [] if the block at address isn't a counting loop. The lines return the exit
+        address once the loop is done, or fall through to the block's own code when the loop
+        wouldn't terminate the way the closed form assumes.
+        """
+        body = []
+        pointer = address
+        while len(body) < self.MAX_BLOCK_LEN:
+            ins = decode(self.mem, pointer)
+            if ins is None:
+                return []
+            body.append(ins)
+            pointer += len(ins.params) + 1
+            if ins.opcode in self._BLOCK_ENDS:
+                break
+        jump = body[-1]
+        if jump.opcode not in (5, 6) or jump.modes != (0, 1) or jump.params[1] != address:
+            return []
+        loop_cells = range(address, pointer)
+
+        # cell -> constant step (int) or invariant cell added each iteration (str)
+        increments = {}
+        compare = None
+        for ins in body[:-1]:
+            if compare is not None:
+                return []   # The compare has to come right before the jump
+            if ins.opcode == 1 and ins.modes[2] == 0:
+                target = ins.params[2]
+                operands = list(zip(ins.params[:2], ins.modes[:2]))
+                if (target, 0) not in operands or target in increments:
+                    return []
+                operands.remove((target, 0))
+                (other, mode), = operands
+                if mode == 2:
+                    return []   # Relative mode cells may alias the counter or flag
+                increments[target] = other if mode == 1 else f'mem[{other}]'
+            elif ins.opcode in (7, 8) and ins.modes == (0, 1, 0):
+                compare = ins
+            else:
+                return []
+
+        tested = jump.params[0]
+        if compare is None:
+            # Decrementing or incrementing to zero: loop while the counter is nonzero
+            if jump.opcode != 5:
+                return []
+            counter, kind, limit, flag = tested, 8, 0, None
+        else:
+            counter, kind, limit, flag = compare.params[0], compare.opcode, compare.params[1], compare.params[2]
+            if flag != tested or flag in increments:
+                return []
+        step = increments.get(counter)
+        if type(step) is not int or step == 0:
+            return []
+        written = set(increments) | ({flag} - {None})
+        if written & set(loop_cells):
+            return []
+        for inc in increments.values():
+            if type(inc) is str and int(inc[4:-1]) in written:
+                return []   # Added cell changes within the loop
+
+        # Number of iterations n >= 1 (0 if the closed form doesn't apply), and the flag value
+        # the loop exits with
+        c0 = f'mem[{counter}]'
+        lines = [f'# {address}: counting loop on {counter}, closed form']
+        if kind == 7 and jump.opcode == 5 and step > 0:       # while counter < limit
+            lines.append(f'n = max(1, -(({c0} - {limit}) // {step}))')
+            exit_flag = 0
+        elif kind == 7 and jump.opcode == 6 and step < 0:     # until counter < limit
+            lines.append(f'n = max(1, ({c0} - {limit}) // {-step} + 1)')
+            exit_flag = 1
+        elif kind == 8 and (jump.opcode == 6 or flag is None):  # until counter == limit
+            lines += [f'diff = {limit} - {c0}',
+                      f'n = diff // {step} if diff % {step} == 0 and diff // {step} >= 1 else 0']
+            exit_flag = 1
+        else:
+            return []
+
+        lines.append('if n:')
+        for cell, inc in increments.items():
+            lines.append(f'    mem[{cell}] = mem[{cell}] + n * {inc}')
+        if flag is not None:
+            lines.append(f'    mem[{flag}] = {exit_flag}')
+        lines += [f'    for cell in {tuple(sorted(written))}:',
+                  '        if cell in cells:',
+                  '            vm._invalidate(cell)',
+                  f'    return {pointer}',
+                  'm = mem._image']
+        return lines
+
+    @classmethod
+    def _store(cls, target, value, nxt):
+        """Source lines that write value to mem[target], then reload the image list.
+
+        Writes can replace the memory's image (e.g. promoting it to hold a big int), so
+        blocks reload it before their next inlined access.
+        """
+        lines = super()._store(target, value, nxt)
+        write_at = 2 if lines[0].startswith('addr =') else 1
+        return lines[:write_at] + ['m = mem._image'] + lines[write_at:]
+
+    @classmethod
+    def _image_store(cls, target, value, nxt):
+        """Source lines that write value straight into the image at the constant address target.
+
+        If value doesn't fit in the image's 64 bit ints, the write goes through mem, which
+        promotes the image to hold it, and the image is reloaded.
+        """
+        lines = super()._store(target, value, nxt)
+        return ['try:',
+                f'    m[{target}] = {value}',
+                'except OverflowError:',
+                f'    mem[{target}] = {value}',
+                '    m = mem._image'] + lines[1:]
+
+    # Compiled block code objects, keyed by block source, least recently used first
+    _BLOCK_CACHE = OrderedDict()
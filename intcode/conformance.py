@@ -0,0 +1,182 @@
+"""Conformance suite: run the examples from every day's __main__ block against every engine.
+
+Run from the repository root with ``python -m intcode.conformance [engine ...]``.
+"""
+import sys
+from functools import partial
+from itertools import permutations
+from pathlib import Path
+from time import perf_counter
+
+from intcode import ENGINES, CompiledIntcode, ReferenceIntcode, get_engine, parse_program
+from intcode.analysis import analyze
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def _read(day, name):
+    return parse_program((ROOT / day / name).read_text())
+
+
+def run_outputs(engine, code, inputs=None):
+    """Run code with inputs to completion and return its outputs."""
+    intcode = engine(code, inputs=inputs)
+    intcode.run()
+    if not intcode.halt:
+        raise RuntimeError(f'Program did not halt (pointer={intcode.pointer})')
+    return list(intcode.outputs)
+
+
+def run_analyzed(engine, code, inputs=None):
+    """run_outputs(), giving engines that take one a static analysis of code."""
+    if issubclass(engine, CompiledIntcode):
+        engine = partial(engine, analysis=analyze(code))
+    return run_outputs(engine, code, inputs)
+
+
+def _padded(code_str, size, **cells):
+    """Program from code_str, padded with zeros to size cells, with cells given as m<address>=value set."""
+    code = parse_program(code_str)
+    code += [0] * (size - len(code))
+    for name, value in cells.items():
+        code[int(name[1:])] = value
+    return code
+
+
+def run_timed(engine, code, inputs=None, slowdown=10):
+    """run_outputs(), and whether engine took at most [slowdown] times as long as the reference engine."""
+    start = perf_counter()
+    run_outputs(ReferenceIntcode, code, inputs)
+    reference = perf_counter() - start
+    start = perf_counter()
+    outputs = run_outputs(engine, code, inputs)
+    return outputs, perf_counter() - start <= slowdown * reference + 0.05
+
+
+def run_error(engine, code, inputs=None):
+    """Run code with inputs and return the name of the exception it fails with, or None."""
+    intcode = engine(code, inputs=inputs)
+    try:
+        intcode.run()
+    except Exception as e:
+        return type(e).__name__
+    return None
+
+
+def run_mem0(engine, code, noun, verb):
+    """Run a day2 program with noun and verb and return mem[0]."""
+    code = code.copy()
+    code[1] = noun
+    code[2] = verb
+    intcode = engine(code)
+    intcode.run()
+    return intcode.mem[0]
+
+
+def max_amp_signal(engine, code, phases, feedback):
+    """Return the highest signal out of a chain of amplifiers over all orders of phases."""
+    best = None
+    for phase_seq in permutations(phases):
+        amps = [engine(code, inputs=[phase]) for phase in phase_seq]
+        signal = 0
+        while True:
+            for amp in amps:
+                amp.add_inputs([signal])
+                amp.run()
+                signal = amp.outputs.pop()
+            if not feedback or amps[-1].halt:
+                break
+        if best is None or signal > best:
+            best = signal
+    return best
+
+
+# (name, function(engine) -> result, expected result)
+CASES = [
+    ('day2 part 1', lambda e: run_mem0(e, _read('day2', 'input_day2.txt'), 12, 2), 9581917),
+    ('day2 part 2', lambda e: run_mem0(e, _read('day2', 'input_day2.txt'), 25, 5), 19690720),
+    ('day5 compare, input 0', lambda e: run_outputs(e, parse_program('3,12,6,12,15,1,13,14,13,4,13,99,-1,0,1,9'),
+                                                    [0]), [0]),
+    ('day5 compare, input 7', lambda e: run_outputs(e, parse_program('3,12,6,12,15,1,13,14,13,4,13,99,-1,0,1,9'),
+                                                    [7]), [1]),
+    ('day5 part 1', lambda e: run_outputs(e, _read('day5', 'input_day5.txt'), [1])[-1], 6745903),
+    ('day5 part 2', lambda e: run_outputs(e, _read('day5', 'input_day5.txt'), [5]), [9168267]),
+    ('day7 example 1', lambda e: max_amp_signal(e, parse_program('3,15,3,16,1002,16,10,16,1,16,15,15,4,15,99,0,0'),
+                                                range(5), False), 43210),
+    ('day7 example 2', lambda e: max_amp_signal(e, parse_program('3,23,3,24,1002,24,10,24,1002,23,-1,23,101,5,23,23,'
+                                                                 '1,24,23,23,4,23,99,0,0'),
+                                                range(5), False), 54321),
+    ('day7 example 3', lambda e: max_amp_signal(e, parse_program('3,31,3,32,1002,32,10,32,1001,31,-2,31,1007,31,0,33,'
+                                                                 '1002,33,7,33,1,33,31,31,1,32,31,31,4,31,99,0,0,0'),
+                                                range(5), False), 65210),
+    ('day7 part 1', lambda e: max_amp_signal(e, _read('day7', 'day7_input.txt'), range(5), False), 20413),
+    ('day7 feedback example 1', lambda e: max_amp_signal(e, parse_program('3,26,1001,26,-4,26,3,27,1002,27,2,27,1,27,'
+                                                                          '26,27,4,27,1001,28,-1,28,1005,28,6,99,0,0,'
+                                                                          '5'),
+                                                         range(5, 10), True), 139629729),
+    ('day7 feedback example 2', lambda e: max_amp_signal(e, parse_program('3,52,1001,52,-5,52,3,53,1,52,56,54,1007,54,'
+                                                                          '5,55,1005,55,26,1001,54,-5,54,1105,1,12,1,'
+                                                                          '53,54,53,1008,54,0,55,1001,55,1,55,2,53,55,'
+                                                                          '53,4,53,1001,56,-1,56,1005,56,6,99,0,0,0,0,'
+                                                                          '10'),
+                                                         range(5, 10), True), 18216),
+    ('day7 part 2', lambda e: max_amp_signal(e, _read('day7', 'day7_input.txt'), range(5, 10), True), 3321777),
+    ('day9 quine', lambda e: run_outputs(e, parse_program('109,1,204,-1,1001,100,1,100,1008,100,16,101,1006,101,0,'
+                                                          '99')),
+     parse_program('109,1,204,-1,1001,100,1,100,1008,100,16,101,1006,101,0,99')),
+    ('day9 16 digit product', lambda e: run_outputs(e, parse_program('1102,34915192,34915192,7,4,7,99,0')),
+     [1219070632396864]),
+    ('day9 large literal', lambda e: run_outputs(e, parse_program('104,1125899906842624,99')), [1125899906842624]),
+    ('day9 part 1', lambda e: run_outputs(e, _read('day9', 'day9_input.txt'), [1]), [2594708277]),
+    ('day9 part 2', lambda e: run_outputs(e, _read('day9', 'day9_input.txt'), [2]), [87721]),
+    # Memory past the program reads as 0, which isn't an opcode
+    ('jump past the end of memory', lambda e: run_error(e, parse_program('1105,1,99')), 'KeyError'),
+    # Counting loops, which the compiled engine runs in closed form
+    ('loop while counter < limit', lambda e: run_outputs(e, _padded('1001,40,3,40,1,41,42,41,1007,40,20,43,1005,43,0,'
+                                                                    '4,40,4,41,4,43,99', 50, m42=5)),
+     [21, 35, 0]),
+    ('loop until counter < limit', lambda e: run_outputs(e, _padded('1001,40,-2,40,1001,41,7,41,1007,40,0,43,1006,43,'
+                                                                    '0,4,40,4,41,99', 50, m40=9)),
+     [-1, 35]),
+    ('loop until counter == limit', lambda e: run_outputs(e, _padded('1001,40,1,40,1001,41,-3,41,1008,40,10,43,1006,'
+                                                                     '43,0,4,40,4,41,4,43,99', 50, m40=4)),
+     [10, -18, 1]),
+    ('loop to zero, relative addend', lambda e: run_outputs(e, _padded('109,50,2001,30,5,30,1001,31,-1,31,1005,31,2,'
+                                                                       '4,30,99', 60, m31=3, m55=7)),
+     [21]),
+    # Increments an operand of its own loop every pass, so engines that compile code have to stop recompiling it
+    ('loop rewriting its own operand', lambda e: run_timed(e, parse_program('1001,5,1,5,1101,0,0,20,1007,20,5000,21,'
+                                                                            '1005,21,0,4,20,99')),
+     ([5000], True)),
+    # Rewrites code at 20 and 21, reached only through a jump to the address stored at 40
+    ('computed jump to rewritten code', lambda e: run_analyzed(e, _padded('1101,7,0,45,105,1,40,1101,8,0,21,1101,1,0,'
+                                                                          '44,105,1,40,99,0,104,7,1005,44,18,105,1,45',
+                                                                          50, m40=20)),
+     [7, 8]),
+]
+
+
+def check(engine):
+    """Run every case on engine. Returns a list of (case name, error message) failures."""
+    failures = []
+    for name, case, expected in CASES:
+        try:
+            result = case(engine)
+        except Exception as e:
+            failures.append((name, f'{type(e).__name__}: {e}'))
+            continue
+        if result != expected:
+            failures.append((name, f'expected {expected}, got {result}'))
+    return failures
+
+
+if __name__ == "__main__":
+    names = sys.argv[1:] or list(ENGINES)
+    failed = False
+    for name in names:
+        failures = check(get_engine(name))
+        print(f'{name}: {len(CASES) - len(failures)}/{len(CASES)} passed')
+        for case, message in failures:
+            print(f'  FAIL {case}: {message}')
+        failed = failed or bool(failures)
+    sys.exit(1 if failed else 0)
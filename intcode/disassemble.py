@@ -0,0 +1,23 @@
+"""Print the disassembly and static analysis of an Intcode program, from intcode.analysis.
+
+Usage: ``python -m intcode.disassemble program.txt``
+"""
+import sys
+
+from intcode import parse_program
+from intcode.analysis import analyze
+
+if __name__ == "__main__":
+    with open(sys.argv[1], 'r') as infile:
+        analysis = analyze(parse_program(infile.read()))
+    print(analysis.listing())
+    print()
+    for loop in analysis.loops:
+        print(f'Loop at {loop.header}: back edges from {sorted(loop.latches)}, blocks {sorted(loop.blocks)}')
+    for write in analysis.writes:
+        print(f'Write into code at {write.address}: target {"unknown" if write.target is None else write.target}')
+    for address in analysis.computed_jumps:
+        print(f'Computed jump at {address}')
+    unreachable = analysis.unreachable()
+    print(f'Unreachable: {"unknown, past computed jumps" if unreachable is None else unreachable}')
+    print(analysis.summary())
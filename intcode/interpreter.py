@@ -0,0 +1,254 @@
+from collections import namedtuple
+
+from intcode.memory import DynamicMem
+from intcode.ringbuffer import RingBuffer
+from intcode.trace import PrintTracer
+
+Opcode = namedtuple('Opcode', ['num_args', 'func'])
+Snapshot = namedtuple('Snapshot', ['mem', 'pointer', 'relative_base', 'halt', 'interactive', 'inputs', 'outputs',
+                                   'capacity'])
+
+
+def writer(func):
+    """Use to tag opcode functions that write to a memory location. Helper for parameter fetching."""
+    func._writer = True
+    return func
+
+
+class Intcode:
+    """Intcode interpreter. Decoded instructions are cached by value, so each step only dispatches.
+
+    Inputs and outputs are RingBuffers holding up to capacity values each (default: unbounded).
+    A VM whose outputs are full holds until they are drained, as it does when out of inputs.
+    A tracer (see intcode.trace) records every instruction run; debug=True prints them instead.
+    """
+    def __init__(self, memory, interactive=False, inputs=None, debug=False, capacity=None, tracer=None):
+        self.mem = DynamicMem(memory)
+        self.pointer = 0
+        self.interactive = interactive
+        self.capacity = capacity
+
+        self.inputs = RingBuffer(() if inputs is None else inputs, capacity)
+
+        if not interactive:
+            self.outputs = RingBuffer((), capacity)
+
+        self.debug = debug
+        self.tracer = PrintTracer() if tracer is None and debug else tracer
+        self.hold_for_input = False
+        self.halt = False
+        self.relative_base = 0
+        self._operands = [0, 0, 0]      # Reused for every instruction's parameter values
+
+    def run(self):
+        """Run until the system halts, runs out of inputs or fills its outputs."""
+        while (not self.halt) and (not self.hold_for_input):
+            self._fetch_op()
+
+        # Running out of inputs (or output space) will break out of the run loop,
+        # but we want to go back into it next time run() is called,
+        # so reset hold_for_input
+        self.hold_for_input = False
+
+    def add_inputs(self, inputs):
+        """Add [inputs] to the input buffer."""
+        self.inputs.feed(inputs)
+
+    def snapshot(self):
+        """Return a Snapshot of the VM state. Memory is shared copy-on-write, so this is cheap."""
+        return Snapshot(mem=self.mem.copy(),
+                        pointer=self.pointer,
+                        relative_base=self.relative_base,
+                        halt=self.halt,
+                        interactive=self.interactive,
+                        inputs=tuple(self.inputs),
+                        outputs=None if self.interactive else tuple(self.outputs),
+                        capacity=self.capacity)
+
+    @classmethod
+    def from_snapshot(cls, snapshot, debug=False):
+        """Return a new VM that resumes from snapshot. The snapshot can be resumed any number of times."""
+        intcode = cls([], interactive=snapshot.interactive, inputs=snapshot.inputs, debug=debug,
+                       capacity=snapshot.capacity)
+        intcode.mem = snapshot.mem.copy()
+        intcode.pointer = snapshot.pointer
+        intcode.relative_base = snapshot.relative_base
+        intcode.halt = snapshot.halt
+        if not snapshot.interactive:
+            intcode.outputs.feed(snapshot.outputs)
+        return intcode
+
+    def fork(self):
+        """Return a new VM in the same state as this one. The two share memory until either writes to it."""
+        return self.from_snapshot(self.snapshot(), debug=self.debug)
+
+    def _fetch_op(self):
+        """Fetch opcode at current pointer, fetch parameters, run the operation, advance the pointer."""
+        # Parse out the instruction value, parameter modes, and parameter values
+        pointer = self.pointer
+        opcode_val = self.mem[pointer]
+        opcode, param_modes, writes = self._decode(opcode_val)
+
+        # Set the default next instruction pointer location to the end of the
+        # current opcode. Opcodes may overwrite this (e.g. jumps)
+        self.next_pointer = pointer + opcode.num_args + 1
+
+        # Run the instruction, after fetching the parameter values based on position/immediate/relative mode
+        if opcode.num_args > 0:
+            param_vals = self._fetch_params_by_mode(opcode.num_args, param_modes, writes)
+            opcode.func(self, param_vals)
+        else:
+            param_vals = ()
+            opcode.func(self)
+
+        # Move the instruction pointer to the next opcode
+        self.pointer = self.next_pointer
+
+        if self.tracer is not None and not self.hold_for_input:
+            self.tracer.trace(self, pointer, opcode_val, param_vals[:opcode.num_args])
+
+    def _decode(self, val):
+        """Returns (Opcode, (param modes), writes) for an instruction value, parsing it on a cache miss."""
+        try:
+            return self._DECODE_CACHE[val]
+        except KeyError:
+            opcode, param_modes = self._parse_opcode_val(val)
+            decoded = (opcode, tuple(param_modes), hasattr(opcode.func, '_writer'))
+            self._DECODE_CACHE[val] = decoded
+            return decoded
+
+    def _parse_opcode_val(self, val):
+        """Returns (Opcode, [param modes]) given the integer opcode value."""
+        val_str = str(val)
+        opcode = self._OPCODES[int(val_str[-2:])]
+        modes_str = val_str[:-2]
+
+        # Prepend leading 0s for parameter modes
+        if len(modes_str) < opcode.num_args:
+            modes_str = '0'*(opcode.num_args - len(modes_str)) + modes_str
+
+        # Parse the parameter mode values, right to left
+        # 0 = position mode, 1 = immediate mode
+        param_modes = [int(v) for v in modes_str[::-1]]
+
+        return opcode, param_modes
+
+    def _fetch_params_by_mode(self, num_args, modes, writes):
+        """Return parameters for the opcode at the pointer, given the parameter modes.
+
+        The values are stored in the VM's one operand list, which the next instruction reuses,
+        so only the first num_args entries are this instruction's.
+        """
+        # Fetch all params by position/immediate/relative mode. If the function is a writer,
+        # the last param will just be passed as memory location to the function.
+        # Params are read one at a time straight from memory, so no slices get built.
+        mem = self.mem
+        first_param = self.pointer + 1
+        num_reads = num_args - 1 if writes else num_args
+        vals = self._operands
+
+        for i in range(num_reads):
+            param = mem[first_param + i]
+            mode = modes[i]
+            if mode == 0:       # Position mode
+                vals[i] = mem[param]
+            elif mode == 1:     # Immediate mode
+                vals[i] = param
+            elif mode == 2:     # Relative mode
+                vals[i] = mem[param + self.relative_base]
+            else:
+                raise ValueError(f'Unknown parameter mode {mode}')
+
+        if writes:
+            param = mem[first_param + num_reads]
+            mode = modes[num_reads]
+            if mode == 0:       # Position mode
+                vals[num_reads] = param
+            elif mode == 2:     # Relative mode
+                vals[num_reads] = param + self.relative_base
+            else:
+                raise ValueError('Memory write in immediate mode')
+
+        return vals
+
+    @writer
+    def _add2(self, param_vals):
+        self.mem[param_vals[2]] = param_vals[0] + param_vals[1]
+
+    @writer
+    def _mult2(self, param_vals):
+        self.mem[param_vals[2]] = param_vals[0] * param_vals[1]
+
+    @writer
+    def _input(self, param_vals):
+        if self.interactive:
+            in_val = int(input('Enter input: '))
+        else:
+            try:
+                in_val = self.inputs.popleft()
+            except IndexError:  # Raised when input buffer is empty
+                # Keep the instruction pointer from advancing so this op
+                # is run again at next run() command, and flag hold
+                # to break out of run loop
+                self.next_pointer = self.pointer
+                self.hold_for_input = True
+                return
+        self.mem[param_vals[0]] = in_val
+
+    def _output(self, param_vals):
+        if not self.interactive:
+            if self.outputs.full():
+                # Hold as for input, and run this op again once the outputs are drained
+                self.next_pointer = self.pointer
+                self.hold_for_input = True
+                return
+            self.outputs.append(param_vals[0])
+        else:
+            print(f'Output: {param_vals[0]}')
+
+    def _jump_if_true(self, param_vals):
+        if param_vals[0]:
+            self.next_pointer = param_vals[1]
+
+    def _jump_if_false(self, param_vals):
+        if not param_vals[0]:
+            self.next_pointer = param_vals[1]
+
+    @writer
+    def _less_than(self, param_vals):
+        self.mem[param_vals[2]] = int(param_vals[0] < param_vals[1])
+
+    @writer
+    def _equal(self, param_vals):
+        self.mem[param_vals[2]] = int(param_vals[0] == param_vals[1])
+
+    def _rel_base_offset(self, param_vals):
+        self.relative_base += param_vals[0]
+
+    def _halt(self):
+        self.halt = True
+
+    _OPCODES = {1: Opcode(num_args=3, func=_add2),
+                2: Opcode(num_args=3, func=_mult2),
+                3: Opcode(num_args=1, func=_input),
+                4: Opcode(num_args=1, func=_output),
+                5: Opcode(num_args=2, func=_jump_if_true),
+                6: Opcode(num_args=2, func=_jump_if_false),
+                7: Opcode(num_args=3, func=_less_than),
+                8: Opcode(num_args=3, func=_equal),
+                9: Opcode(num_args=1, func=_rel_base_offset),
+                99: Opcode(num_args=0, func=_halt)}
+
+    # Decoded instructions, keyed by instruction value. Decoding only depends on the value,
+    # so entries stay valid when a program overwrites its own code, and every instance shares them.
+    _DECODE_CACHE = {}
+
+
+class ReferenceIntcode(Intcode):
+    """Intcode interpreter that parses every instruction from its string form, with no caching.
+
+    This is the straightforward implementation the other engines are checked against.
+    """
+    def _decode(self, val):
+        opcode, param_modes = self._parse_opcode_val(val)
+        return opcode, param_modes, hasattr(opcode.func, '_writer')
@@ -0,0 +1,109 @@
+from array import array
+
+
+class DynamicMem:
+    """Memory that reads as 0 and grows as needed past the last element. Treat like a list.
+
+    The program image is stored densely in an array('q'). Addresses past it live in fixed-size
+    pages that are only allocated the first time they are written, so memory use follows the
+    addresses a program actually touches. The image or a page is promoted to a list of Python
+    ints the first time it has to hold a value that doesn't fit in 64 bits.
+
+    copy() shares the image and pages between both memories. Each copies a shared image or
+    page the first time it writes to it.
+    """
+    PAGE_BITS = 10
+    PAGE_SIZE = 1 << PAGE_BITS
+
+    def __init__(self, content):
+        self._image = self._new_store(content)
+        self._pages = {}
+        self._size = len(self._image)
+        self._owns_image = True
+        self._owned_pages = set()
+
+    def __get__(self):
+        return self[0:len(self)]
+
+    def __getitem__(self, indices):
+        """Get slice/index from the memory. Addresses that were never written are 0."""
+        if type(indices) is slice:
+            start = 0 if indices.start is None else indices.start
+            stop = len(self) if indices.stop is None else indices.stop
+            if start < 0:
+                raise IndexError('Memory locations < 0 are not valid')
+            if stop <= len(self._image):
+                return list(self._image[start:stop])
+            return [self[i] for i in range(start, stop)]
+        if indices < 0:
+            raise IndexError('Memory locations < 0 are not valid')
+        if indices < len(self._image):
+            return self._image[indices]
+        page = self._pages.get(indices >> self.PAGE_BITS)
+        if page is None:
+            return 0
+        return page[indices & (self.PAGE_SIZE - 1)]
+
+    def __setitem__(self, index, value):
+        """Set value at index, allocating its page or promoting its storage if needed."""
+        if index < 0:
+            raise IndexError('Memory locations < 0 are not valid')
+        if index < len(self._image):
+            if not self._owns_image:
+                self._image = self._image[:]
+                self._owns_image = True
+            try:
+                self._image[index] = value
+            except OverflowError:
+                self._image = list(self._image)
+                self._image[index] = value
+            return
+
+        page_num = index >> self.PAGE_BITS
+        page = self._pages.get(page_num)
+        if page is None:
+            page = self._pages[page_num] = self._new_store(bytes(8 * self.PAGE_SIZE))
+            self._owned_pages.add(page_num)
+        elif page_num not in self._owned_pages:
+            page = self._pages[page_num] = page[:]
+            self._owned_pages.add(page_num)
+        try:
+            page[index & (self.PAGE_SIZE - 1)] = value
+        except OverflowError:
+            page = self._pages[page_num] = list(page)
+            page[index & (self.PAGE_SIZE - 1)] = value
+        if index >= self._size:
+            self._size = index + 1
+
+    def writable_image(self):
+        """Return the image for writing to directly, copying it first if it is shared."""
+        if not self._owns_image:
+            self._image = self._image[:]
+            self._owns_image = True
+        return self._image
+
+    def __len__(self):
+        return self._size
+
+    def copy(self):
+        """Return a copy-on-write copy of the memory."""
+        clone = DynamicMem.__new__(DynamicMem)
+        clone._image = self._image
+        clone._pages = self._pages.copy()
+        clone._size = self._size
+        # Neither memory may write to storage the other can see any more
+        self._owns_image = clone._owns_image = False
+        self._owned_pages = set()
+        clone._owned_pages = set()
+        return clone
+
+    def __str__(self):
+        return str(self[0:len(self)])
+
+    @staticmethod
+    def _new_store(content):
+        """Return content as an array of 64 bit ints, or as a list if any value is too big."""
+        try:
+            return array('q', content)
+        except OverflowError:
+            return list(content)
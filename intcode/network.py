@@ -0,0 +1,152 @@
+"""Event-driven scheduling for networks of Intcode VMs.
+
+Every output a VM produces is sent straight to the inputs of the VMs it is connected to.
+Only VMs with new input (or that haven't started) are run, so a network costs scheduler passes
+in proportion to the useful work it does, however many VMs are idle.
+"""
+from collections import deque
+from time import perf_counter
+
+
+class Node:
+    """A VM in a Network, with the VMs its outputs go to and counters for how it was scheduled."""
+    def __init__(self, name, vm):
+        self.name = name
+        self.vm = vm
+        self.consumers = []
+        self.runs = 0               # Number of times the VM was run
+        self.run_time = 0.0         # Seconds spent running
+        self.blocked_time = 0.0     # Seconds spent waiting for input while other VMs ran
+        self.blocked_since = None
+        self.ready = False
+        self.waiting = []           # Producers with outputs that didn't fit in this VM's inputs
+
+    def __repr__(self):
+        return (f'Node({self.name!r}, runs={self.runs}, run_time={self.run_time:.6f}, '
+                f'blocked_time={self.blocked_time:.6f}, halt={self.vm.halt})')
+
+
+class Network:
+    """Graph of Intcode VMs. Outputs of a VM are appended to the inputs of each of its consumers.
+
+    VMs with no consumers keep their outputs in vm.outputs. With bounded buffers, outputs are
+    only moved once every consumer has room for them; the rest wait in the producer's outputs
+    until those consumers have run.
+    """
+    def __init__(self):
+        self.nodes = {}
+        self._ready = deque()
+
+    @classmethod
+    def from_graph(cls, vms, edges):
+        """Build a network from {name: vm} and {name: [names of consumers]}."""
+        network = cls()
+        for name, vm in vms.items():
+            network.add(name, vm)
+        for name, consumers in edges.items():
+            for consumer in consumers:
+                network.connect(name, consumer)
+        return network
+
+    def add(self, name, vm):
+        """Add vm to the network as [name]. It is scheduled to run until its first input."""
+        node = self.nodes[name] = Node(name, vm)
+        self._schedule(node)
+        return node
+
+    def connect(self, producer, consumer):
+        """Send the outputs of VM [producer] to VM [consumer]."""
+        self.nodes[producer].consumers.append(self.nodes[consumer])
+
+    def send(self, name, values):
+        """Add values to the inputs of VM [name] from outside the network."""
+        node = self.nodes[name]
+        node.vm.add_inputs(values)
+        self._schedule(node)
+
+    def run(self):
+        """Run VMs until every VM has halted or is waiting for input nobody will send."""
+        ready = self._ready
+        while ready:
+            node = ready.popleft()
+            node.ready = False
+            vm = node.vm
+
+            start = perf_counter()
+            vm.run()
+            end = perf_counter()
+            node.runs += 1
+            node.run_time += end - start
+
+            self._forward(node)
+            # Having run, the VM has room in its inputs for producers that were waiting on it
+            waiting, node.waiting = node.waiting, []
+            for producer in waiting:
+                self._forward(producer)
+            if not vm.halt and not node.ready:
+                node.blocked_since = perf_counter()
+
+    def halted(self):
+        """True if every VM in the network has halted."""
+        return all(node.vm.halt for node in self.nodes.values())
+
+    def _forward(self, node):
+        """Move as many of node's outputs as every one of its consumers has room for.
+
+        A producer that stopped for space in its outputs is scheduled again once it has some.
+        """
+        outputs = node.vm.outputs
+        if not node.consumers or not outputs:
+            return
+        held_on_output = outputs.full()
+        count = min([len(outputs)] + [consumer.vm.inputs.capacity - len(consumer.vm.inputs)
+                                      for consumer in node.consumers if consumer.vm.inputs.capacity is not None])
+        values = outputs.drain() if count == len(outputs) else [outputs.popleft() for _ in range(count)]
+        if values:
+            for consumer in node.consumers:
+                consumer.vm.add_inputs(values)
+                self._schedule(consumer)
+        if outputs:
+            for consumer in node.consumers:
+                if consumer.vm.inputs.full() and node not in consumer.waiting:
+                    consumer.waiting.append(node)
+        if held_on_output and not outputs.full():
+            self._schedule(node)
+
+    def _schedule(self, node):
+        """Queue node to run, unless it has halted or is already queued."""
+        if node.ready or node.vm.halt:
+            return
+        if node.blocked_since is not None:
+            node.blocked_time += perf_counter() - node.blocked_since
+            node.blocked_since = None
+        node.ready = True
+        self._ready.append(node)
+
+
+if __name__ == "__main__":
+    from intcode import Intcode, parse_program
+
+    with open('day7/day7_input.txt', 'r') as infile:
+        code = parse_program(infile.read())
+
+    # Day 7 part 2's best phase sequence as a ring of five amps
+    amps = {i: Intcode(code, inputs=[phase]) for i, phase in enumerate((5, 9, 6, 8, 7))}
+    network = Network.from_graph(amps, {i: [(i + 1) % 5] for i in range(5)})
+    network.send(0, [0])
+    network.run()
+    print(f'Signal: {amps[0].inputs[-1]}')
+    for node in network.nodes.values():
+        print(node)
+
+    # A ring of 500 feedback amps, whose last amp also feeds a binary tree of 500 one-shot amps
+    amps = {i: Intcode(code, inputs=[5 + i % 5]) for i in range(500)}
+    amps.update({i: Intcode(code, inputs=[i % 5]) for i in range(500, 1000)})
+    edges = {i: [(i + 1) % 500] for i in range(500)}
+    edges.update({i: [c for c in (2*i - 499, 2*i - 498) if c < 1000] for i in range(500, 750)})
+    edges[499].append(500)
+    network = Network.from_graph(amps, edges)
+    network.send(0, [0])
+    network.run()
+    runs = sum(node.runs for node in network.nodes.values())
+    print(f'1000 VMs: {runs} runs, all halted: {network.halted()}')
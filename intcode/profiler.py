@@ -0,0 +1,179 @@
+"""Instruction-level profiling for Intcode programs.
+
+ProfilingIntcode is an interpreter that records a Profile as it runs. The other engines are
+untouched, so profiling costs nothing unless you run under it:
+
+    vm = ProfilingIntcode(code, inputs=[2])
+    vm.run()
+    print(vm.profile.report())
+    vm.profile.write_collapsed('day9.folded')     # For flamegraph.pl or speedscope
+    vm.profile.write_json('day9.json')
+
+Intcode has no call instruction, so calls are inferred from the usual idiom: a taken jump to a
+constant address right after an instruction that stored the jump's own return address. A
+later jump to that return address is the matching return.
+"""
+import json
+from collections import Counter, namedtuple
+from time import perf_counter
+
+from intcode.interpreter import Intcode
+from intcode.trace import OPCODE_NAMES
+
+# Instructions run from start_address up to an I/O event (or the end of a run) at end_address
+Segment = namedtuple('Segment', ['start_address', 'end_address', 'instructions', 'seconds', 'event'])
+
+
+class Profile:
+    """Counts and timings recorded by a ProfilingIntcode."""
+    def __init__(self):
+        self.executions = Counter()     # address -> times the instruction there ran
+        self.opcodes = Counter()        # opcode number -> times run
+        self.reads = Counter()          # address -> position/relative mode reads
+        self.writes = Counter()         # address -> writes
+        self.stacks = Counter()         # tuple of inferred function frames -> instructions run
+        self.segments = []
+
+    @property
+    def instructions(self):
+        return sum(self.opcodes.values())
+
+    def hot_addresses(self, n=10):
+        """Return the n most executed (address, count) pairs."""
+        return self.executions.most_common(n)
+
+    def collapsed(self):
+        """Return the call stacks in collapsed format, one 'frame;frame count' line per stack."""
+        return ''.join(f'{";".join(stack)} {count}\n' for stack, count in sorted(self.stacks.items()))
+
+    def summary(self, top=20):
+        """Return a JSON-serializable summary of the profile."""
+        return {'instructions': self.instructions,
+                'opcodes': {OPCODE_NAMES[op]: count for op, count in self.opcodes.most_common()},
+                'hot_addresses': [{'address': a, 'count': c} for a, c in self.hot_addresses(top)],
+                'reads': [{'address': a, 'count': c} for a, c in self.reads.most_common(top)],
+                'writes': [{'address': a, 'count': c} for a, c in self.writes.most_common(top)],
+                'functions': {';'.join(stack): count for stack, count in self.stacks.most_common(top)},
+                'segments': [segment._asdict() for segment in self.segments]}
+
+    def write_collapsed(self, path):
+        with open(path, 'w') as outfile:
+            outfile.write(self.collapsed())
+
+    def write_json(self, path, top=20):
+        with open(path, 'w') as outfile:
+            json.dump(self.summary(top), outfile, indent=2)
+
+    def report(self, top=10):
+        """Return a readable report of the hottest instructions, opcodes, and I/O segments."""
+        total = self.instructions or 1
+        lines = [f'{self.instructions} instructions, {len(self.segments)} segments, '
+                 f'{sum(s.seconds for s in self.segments):.3f}s']
+        lines.append('Hottest addresses:')
+        lines += [f'  {address:>6} {count:>10} {100 * count / total:5.1f}%'
+                  for address, count in self.hot_addresses(top)]
+        lines.append('Opcodes:')
+        lines += [f'  {OPCODE_NAMES[op]:>6} {count:>10} {100 * count / total:5.1f}%'
+                  for op, count in self.opcodes.most_common()]
+        lines.append('Longest segments between I/O:')
+        lines += [f'  {s.start_address:>6} -> {s.end_address:<6} {s.instructions:>10} instructions '
+                  f'{s.seconds:.6f}s  {s.event}'
+                  for s in sorted(self.segments, key=lambda s: s.instructions, reverse=True)[:top]]
+        return '\n'.join(lines)
+
+
+class ProfilingIntcode(Intcode):
+    """Intcode interpreter that records what it runs in self.profile."""
+    def __init__(self, memory, interactive=False, inputs=None, debug=False, capacity=None, tracer=None,
+                 profile=None):
+        super().__init__(memory, interactive=interactive, inputs=inputs, debug=debug, capacity=capacity,
+                         tracer=tracer)
+        self.profile = Profile() if profile is None else profile
+        self._frames = [('main', None)]     # (frame name, return address)
+        self._stack = ('main',)
+        self._last_write = None             # Value stored by the last instruction, if it stored one
+
+    def run(self):
+        """Run until the system halts, runs out of inputs or fills its outputs."""
+        self._segment_start = (self.pointer, self.profile.instructions, perf_counter())
+        super().run()
+        if self.profile.instructions > self._segment_start[1]:
+            self._end_segment('halt' if self.halt else 'wait')
+
+    def _fetch_op(self):
+        profile = self.profile
+        mem = self.mem
+        pointer = self.pointer
+        opcode_val = mem[pointer]
+        opcode, modes, writes = self._decode(opcode_val)
+        num = opcode_val % 100
+
+        num_reads = opcode.num_args - 1 if writes else opcode.num_args
+        reads = []
+        for i in range(num_reads):
+            if modes[i] == 0:
+                reads.append(mem[pointer + 1 + i])
+            elif modes[i] == 2:
+                reads.append(mem[pointer + 1 + i] + self.relative_base)
+        target = None
+        if writes:
+            target = mem[pointer + opcode.num_args]
+            if modes[num_reads] == 2:
+                target += self.relative_base
+
+        super()._fetch_op()
+        if self.hold_for_input:
+            return      # Didn't run, it will be run again
+
+        profile.executions[pointer] += 1
+        profile.opcodes[num] += 1
+        profile.stacks[self._stack] += 1
+        for address in reads:
+            profile.reads[address] += 1
+        if writes:
+            profile.writes[target] += 1
+
+        if num == 5 or num == 6:
+            self._track_call(pointer, modes[1] == 1)
+        if num == 3 or num == 4:
+            self._end_segment(f'{OPCODE_NAMES[num]}@{pointer}')
+        self._last_write = mem[target] if writes else None
+
+    def _track_call(self, pointer, constant_target):
+        """Update the inferred call stack after the jump at pointer."""
+        return_address = pointer + 3
+        if self.pointer == return_address:
+            return      # Not taken
+        if constant_target and self._last_write == return_address:
+            self._frames.append((f'fn@{self.pointer}', return_address))
+        else:
+            # Pop back to the frame this jump returns from, if it returns from any
+            for depth in range(len(self._frames) - 1, 0, -1):
+                if self._frames[depth][1] == self.pointer:
+                    del self._frames[depth:]
+                    break
+            else:
+                return
+        self._stack = tuple(name for name, _ in self._frames)
+
+    def _end_segment(self, event):
+        start_address, start_count, start_time = self._segment_start
+        now = perf_counter()
+        count = self.profile.instructions
+        self.profile.segments.append(Segment(start_address, self.pointer, count - start_count,
+                                             now - start_time, event))
+        self._segment_start = (self.pointer, count, now)
+
+
+if __name__ == "__main__":
+    import sys
+
+    from intcode import parse_program
+
+    # Usage: python -m intcode.profiler program.txt [input ...]
+    with open(sys.argv[1], 'r') as infile:
+        code = parse_program(infile.read())
+    vm = ProfilingIntcode(code, inputs=[int(v) for v in sys.argv[2:]])
+    vm.run()
+    print(f'Outputs: {list(vm.outputs)}')
+    print(vm.profile.report())
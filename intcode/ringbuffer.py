@@ -0,0 +1,76 @@
+from collections import deque
+
+
+class RingBuffer(deque):
+    """FIFO of VM inputs or outputs with O(1) append and popleft, and bulk feed() and drain().
+
+    With a capacity, adding values that don't fit raises BufferError and full() tells a
+    producer to wait. Without one the buffer grows as needed.
+    """
+    def __init__(self, values=(), capacity=None):
+        super().__init__()
+        self.capacity = capacity
+        self.feed(values)
+
+    def feed(self, values):
+        """Append every value in values, in order."""
+        self.extend(values)
+
+    def append(self, value):
+        if self.capacity is not None and len(self) >= self.capacity:
+            self._refuse(1)
+        super().append(value)
+
+    def appendleft(self, value):
+        if self.capacity is not None and len(self) >= self.capacity:
+            self._refuse(1)
+        super().appendleft(value)
+
+    def extend(self, values):
+        if self.capacity is not None:
+            values = list(values)
+            if len(self) + len(values) > self.capacity:
+                self._refuse(len(values))
+        super().extend(values)
+
+    def extendleft(self, values):
+        if self.capacity is not None:
+            values = list(values)
+            if len(self) + len(values) > self.capacity:
+                self._refuse(len(values))
+        super().extendleft(values)
+
+    def insert(self, index, value):
+        if self.capacity is not None and len(self) >= self.capacity:
+            self._refuse(1)
+        super().insert(index, value)
+
+    def __iadd__(self, values):
+        self.extend(values)
+        return self
+
+    def drain(self):
+        """Remove and return every value, oldest first."""
+        values = list(self)
+        self.clear()
+        return values
+
+    def full(self):
+        """True if the buffer is at capacity."""
+        return self.capacity is not None and len(self) >= self.capacity
+
+    def copy(self):
+        """Return a shallow copy with the same capacity."""
+        return type(self)(self, self.capacity)
+
+    __copy__ = copy
+
+    def __reduce__(self):
+        return type(self), (list(self), self.capacity)
+
+    def _refuse(self, count):
+        raise BufferError(f'{count} values won\'t fit in a buffer holding {len(self)} of {self.capacity}')
+
+    def __repr__(self):
+        return f'RingBuffer({list(self)}, capacity={self.capacity})'
+
@@ -0,0 +1,147 @@
+from intcode.interpreter import Intcode
+
+
+class ThreadedIntcode(Intcode):
+    """Intcode that translates each instruction into a closure with its parameter modes baked in.
+
+    An instruction is translated the first time the pointer reaches it. Each closure runs the
+    instruction and returns the address of the next one, or None when the VM halts or needs
+    input. Writes into memory that a closure was translated from drop that closure, so
+    self-modifying programs are re-translated from the new code.
+    """
+    def __init__(self, memory, interactive=False, inputs=None, debug=False, capacity=None, tracer=None):
+        super().__init__(memory, interactive=interactive, inputs=inputs, debug=debug, capacity=capacity,
+                         tracer=tracer)
+        self._code = {}         # instruction address -> closure
+        self._code_cells = {}   # memory address -> addresses of code translated from it
+
+    def run(self):
+        """Run until the system halts, runs out of inputs or fills its outputs."""
+        if self.tracer is not None:
+            # Closures don't trace, so fall back to the interpreter
+            return super().run()
+        if self.halt:
+            return
+
+        code = self._code
+        pointer = self.pointer
+        while pointer is not None:
+            try:
+                op = code[pointer]
+            except KeyError:
+                op = self._translate(pointer)
+            pointer = op()
+
+        self.hold_for_input = False
+
+    def _translate(self, address):
+        """Build, store, and return the closure for the instruction at address."""
+        opcode, param_modes, writes = self._decode(self.mem[address])
+        next_address = address + opcode.num_args + 1
+        params = [self.mem[i] for i in range(address + 1, next_address)]
+
+        key = (opcode.func, param_modes)
+        try:
+            factory = self._FACTORY_CACHE[key]
+        except KeyError:
+            factory = self._build_factory(opcode, param_modes, writes)
+            self._FACTORY_CACHE[key] = factory
+
+        op = factory(self, self.mem, self._code_cells, address, next_address, *params)
+        self._add_code(address, op, range(address, next_address))
+        return op
+
+    def _add_code(self, address, op, cells):
+        """Store op as the code for address, translated from memory addresses [cells]."""
+        self._code[address] = op
+        for cell in cells:
+            self._code_cells.setdefault(cell, set()).add(address)
+
+    def _invalidate(self, cell):
+        """Drop code translated from memory address cell."""
+        for address in self._code_cells.pop(cell, ()):
+            self._code.pop(address, None)
+
+    @classmethod
+    def _build_factory(cls, opcode, param_modes, writes):
+        """Generate a function that builds closures for one opcode and set of parameter modes."""
+        names = [f'p{i}' for i in range(opcode.num_args)]
+        reads = []
+        for name, mode in zip(names, param_modes):
+            if mode == 0:       # Position mode
+                reads.append(f'mem[{name}]')
+            elif mode == 1:     # Immediate mode
+                reads.append(name)
+            else:               # Relative mode
+                reads.append(f'mem[vm.relative_base + {name}]')
+        target = None
+        if writes:
+            if param_modes[-1] == 0:
+                target = names[-1]
+            elif param_modes[-1] == 2:
+                target = f'vm.relative_base + {names[-1]}'
+            else:
+                raise ValueError('Memory write in immediate mode')
+
+        body = cls._OP_BODIES[opcode.func](reads, lambda value: cls._store(target, value, 'nxt'), 'here')
+        if not body[-1].startswith('return'):
+            body.append('return nxt')
+        src = (f'def factory(vm, mem, cells, here, nxt, {", ".join(names)}):\n'
+               f'    def op():\n' +
+               ''.join(f'        {line}\n' for line in body) +
+               f'    return op\n')
+        namespace = {}
+        exec(src, namespace)
+        return namespace['factory']
+
+    @classmethod
+    def _store(cls, target, value, nxt):
+        """Source lines that write value to mem[target].
+
+        If the write lands on translated code, that code is dropped and control returns
+        to the run loop at nxt so the rest of the program is translated from the new memory.
+        """
+        lines = []
+        if not (target.isidentifier() or target.isdigit()):
+            lines.append(f'addr = {target}')
+            target = 'addr'
+        return lines + [f'mem[{target}] = {value}',
+                        f'if {target} in cells:',
+                        f'    vm._invalidate({target})',
+                        f'    return {nxt}']
+
+    # Source line generators for each opcode, called with (read expressions, store(value), here).
+    # Lines fall through to the next instruction unless they return.
+    _OP_BODIES = {
+        Intcode._add2: lambda r, store, here: store(f'{r[0]} + {r[1]}'),
+        Intcode._mult2: lambda r, store, here: store(f'{r[0]} * {r[1]}'),
+        Intcode._input: lambda r, store, here: ['if vm.interactive:',
+                                                "    val = int(input('Enter input: '))",
+                                                'elif vm.inputs:',
+                                                '    val = vm.inputs.popleft()',
+                                                'else:',
+                                                f'    vm.pointer = {here}',
+                                                '    vm.hold_for_input = True',
+                                                '    return None'] + store('val'),
+        Intcode._output: lambda r, store, here: ['if vm.interactive:',
+                                                 f"    print(f'Output: {{{r[0]}}}')",
+                                                 'elif vm.outputs.full():',
+                                                 f'    vm.pointer = {here}',
+                                                 '    vm.hold_for_input = True',
+                                                 '    return None',
+                                                 'else:',
+                                                 f'    vm.outputs.append({r[0]})'],
+        Intcode._jump_if_true: lambda r, store, here: [f'if {r[0]}:',
+                                                       f'    return {r[1]}'],
+        Intcode._jump_if_false: lambda r, store, here: [f'if not {r[0]}:',
+                                                        f'    return {r[1]}'],
+        Intcode._less_than: lambda r, store, here: store(f'int({r[0]} < {r[1]})'),
+        Intcode._equal: lambda r, store, here: store(f'int({r[0]} == {r[1]})'),
+        Intcode._rel_base_offset: lambda r, store, here: [f'vm.relative_base += {r[0]}'],
+        Intcode._halt: lambda r, store, here: ['vm.halt = True',
+                                               f'vm.pointer = {here} + 1',
+                                               'return None'],
+    }
+
+    # Closure factories, keyed by (opcode function, parameter modes)
+    _FACTORY_CACHE = {}
@@ -0,0 +1,144 @@
+"""Execution tracing for Intcode VMs.
+
+A Tracer keeps the last [size] instructions a VM ran as fixed-width records in a preallocated
+array, so tracing a long run costs a few stores per instruction and bounded memory:
+
+    vm = Intcode(code, tracer=Tracer(10000, opcodes={3, 4}))
+    vm.run()
+    vm.tracer.dump('run.trace')
+
+Decode a dump with ``python -m intcode.tracedump run.trace [last N records]``.
+"""
+import struct
+import sys
+from array import array
+from collections import namedtuple
+
+OPCODE_NAMES = {1: 'add', 2: 'mul', 3: 'in', 4: 'out', 5: 'jnz', 6: 'jz', 7: 'lt', 8: 'eq', 9: 'arb', 99: 'halt'}
+
+# a, b, c are the instruction's parameters after mode resolution: values read, then the address
+# written to for writers. result is the value written, the value output, the pointer after a
+# jump, or the relative base after an adjustment.
+TraceRecord = namedtuple('TraceRecord', ['step', 'pointer', 'instruction', 'relative_base', 'a', 'b', 'c', 'result'])
+WIDTH = len(TraceRecord._fields)
+
+# Stored in place of values that don't fit in 64 bits
+OVERFLOW = -2**63
+
+# Dump header: magic, format version, record width, buffer size, records written
+_HEADER = struct.Struct('<4sHHQQ')
+_MAGIC = b'ICTR'
+_VERSION = 1
+
+
+class Tracer:
+    """Ring buffer of the last [size] TraceRecords.
+
+    Only instructions at addresses in [addresses] (e.g. a range) and with opcode numbers in
+    [opcodes] are recorded, when given. step numbers count every instruction, so gaps show
+    where filtered instructions ran.
+    """
+    def __init__(self, size=4096, addresses=None, opcodes=None):
+        self.size = size
+        self.addresses = addresses
+        self.opcodes = None if opcodes is None else frozenset(opcodes)
+        self.count = 0      # Records written, including any overwritten since
+        self.steps = 0      # Instructions seen, including filtered ones
+        self._buffer = array('q', bytes(8 * WIDTH * size))
+
+    def trace(self, vm, pointer, instruction, param_vals):
+        """Record the instruction that just ran at pointer, unless it is filtered out."""
+        step = self.steps
+        self.steps += 1
+        if self.addresses is not None and pointer not in self.addresses:
+            return
+        opcode = instruction % 100
+        if self.opcodes is not None and opcode not in self.opcodes:
+            return
+
+        if opcode in (1, 2, 3, 7, 8):
+            result = vm.mem[param_vals[-1]]
+        elif opcode == 4:
+            result = param_vals[0]
+        elif opcode == 9:
+            result = vm.relative_base
+        else:
+            result = vm.pointer
+        a, b, c = (tuple(param_vals) + (0, 0, 0))[:3]
+        self.record(TraceRecord(step, pointer, instruction, vm.relative_base, a, b, c, result))
+
+    def record(self, record):
+        buffer = self._buffer
+        start = (self.count % self.size) * WIDTH
+        try:
+            for i, value in enumerate(record):
+                buffer[start + i] = value
+        except OverflowError:
+            for i, value in enumerate(record):
+                buffer[start + i] = value if OVERFLOW < value < -OVERFLOW else OVERFLOW
+        self.count += 1
+
+    def records(self):
+        """Return the recorded TraceRecords, oldest first."""
+        return _unpack(self._ordered())
+
+    def clear(self):
+        self.count = 0
+        self.steps = 0
+
+    def dump(self, path):
+        """Write the recorded instructions to a binary file that load() reads back."""
+        data = self._ordered()
+        if sys.byteorder == 'big':
+            data.byteswap()
+        with open(path, 'wb') as outfile:
+            outfile.write(_HEADER.pack(_MAGIC, _VERSION, WIDTH, self.size, self.count))
+            outfile.write(data.tobytes())
+
+    def _ordered(self):
+        """Array of the recorded fields, oldest record first."""
+        if self.count <= self.size:
+            return self._buffer[:self.count * WIDTH]
+        split = (self.count % self.size) * WIDTH
+        return self._buffer[split:] + self._buffer[:split]
+
+
+class PrintTracer(Tracer):
+    """Tracer that prints every instruction as it runs instead of storing it. Used for debug=True."""
+    def __init__(self, addresses=None, opcodes=None):
+        super().__init__(size=0, addresses=addresses, opcodes=opcodes)
+
+    def record(self, record):
+        print(format_record(record))
+
+
+def load(path):
+    """Return the TraceRecords in a file written by Tracer.dump(), oldest first."""
+    with open(path, 'rb') as infile:
+        magic, version, width, size, count = _HEADER.unpack(infile.read(_HEADER.size))
+        if magic != _MAGIC or version != _VERSION or width != WIDTH:
+            raise ValueError(f'{path} is not a version {_VERSION} Intcode trace')
+        data = array('q')
+        data.frombytes(infile.read())
+    if sys.byteorder == 'big':
+        data.byteswap()
+    return _unpack(data)
+
+
+def format_record(record):
+    """Return a TraceRecord as one line of text."""
+    opcode = record.instruction % 100
+    name = OPCODE_NAMES.get(opcode, '?')
+    num_params = {99: 0, 3: 1, 4: 1, 9: 1, 5: 2, 6: 2}.get(opcode, 3)
+    params = ', '.join(_value(v) for v in (record.a, record.b, record.c)[:num_params])
+    return (f'{record.step:>10}  {record.pointer:>6}: {record.instruction:<6} {name:<4} {params:<40} '
+            f'-> {_value(record.result):<20} rb={record.relative_base}')
+
+
+def _value(value):
+    return '<overflow>' if value == OVERFLOW else str(value)
+
+
+def _unpack(data):
+    return [TraceRecord(*data[i:i + WIDTH]) for i in range(0, len(data), WIDTH)]
+
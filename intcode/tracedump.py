@@ -0,0 +1,14 @@
+"""Print the records in a trace file written by intcode.trace.Tracer.dump().
+
+Usage: ``python -m intcode.tracedump trace_file [last N records]``
+"""
+import sys
+
+from intcode.trace import format_record, load
+
+if __name__ == "__main__":
+    records = load(sys.argv[1])
+    if len(sys.argv) > 2:
+        records = records[-int(sys.argv[2]):]
+    for record in records:
+        print(format_record(record))